@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, TypedDict
+import httpx
+
+"""
+Model backends for the Create Post AI assistant.
+
+Every backend streams the completion token by token. The backend is picked
+from the environment:
+
+- AI_BACKEND_URL set: any OpenAI-compatible /v1/chat/completions endpoint
+  (AI_API_KEY and AI_MODEL optional). `python -m app.ai_stub_server` runs
+  a local stub of that API for testing.
+- otherwise: a canned offline response streamed word by word.
+"""
+
+SYSTEM_PROMPT = (
+    "You are an assistant that writes clear, professional LinkedIn posts. "
+    "Answer with the post text only."
+)
+
+
+class AssistantMessage(TypedDict):
+    role: str
+    content: str
+
+
+class GenerationMetrics(TypedDict):
+    ttft_ms: float
+    total_ms: float
+    tokens: int
+    tokens_per_second: float
+
+
+class AssistantBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def stream(self, messages: list[AssistantMessage]) -> AsyncIterator[str]: ...
+
+
+class OfflineBackend(AssistantBackend):
+    name = "offline"
+
+    def __init__(self, token_delay: float = 0.03):
+        self.token_delay = token_delay
+
+    async def stream(self, messages: list[AssistantMessage]) -> AsyncIterator[str]:
+        prompt = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        )
+        response_text = f"This is an AI-generated response for: '{prompt}'. It could be a more detailed and professional post about this topic, ready for LinkedIn."
+        for index, word in enumerate(response_text.split(" ")):
+            await asyncio.sleep(self.token_delay)
+            yield word if index == 0 else f" {word}"
+
+
+class OpenAICompatibleBackend(AssistantBackend):
+    name = "openai-compatible"
+
+    def __init__(self, base_url: str, api_key: str = "", model: str = "default"):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+
+    async def stream(self, messages: list[AssistantMessage]) -> AsyncIterator[str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        payload = {
+            "model": self.model,
+            "stream": True,
+            "messages": [{"role": "system", "content": SYSTEM_PROMPT}, *messages],
+        }
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=5.0)) as client:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/v1/chat/completions",
+                headers=headers,
+                json=payload,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:") :].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    token = (choices[0].get("delta") or {}).get("content")
+                    if token:
+                        yield token
+
+
+def get_assistant_backend() -> AssistantBackend:
+    base_url = os.environ.get("AI_BACKEND_URL")
+    if base_url:
+        return OpenAICompatibleBackend(
+            base_url,
+            api_key=os.environ.get("AI_API_KEY", ""),
+            model=os.environ.get("AI_MODEL", "default"),
+        )
+    return OfflineBackend()
+
+
+class GenerationTimer:
+    def __init__(self, backend_name: str):
+        self.backend_name = backend_name
+        self.started = time.perf_counter()
+        self.first_token_at: float | None = None
+        self.tokens = 0
+
+    def record_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.tokens += 1
+
+    def finish(self) -> GenerationMetrics:
+        finished = time.perf_counter()
+        first_token_at = self.first_token_at or finished
+        streaming_seconds = finished - first_token_at
+        metrics: GenerationMetrics = {
+            "ttft_ms": round((first_token_at - self.started) * 1000, 1),
+            "total_ms": round((finished - self.started) * 1000, 1),
+            "tokens": self.tokens,
+            "tokens_per_second": round(self.tokens / streaming_seconds, 1)
+            if streaming_seconds > 0
+            else 0.0,
+        }
+        logging.info(
+            f"AI generation ({self.backend_name}): ttft={metrics['ttft_ms']}ms "
+            f"total={metrics['total_ms']}ms tokens={metrics['tokens']} "
+            f"rate={metrics['tokens_per_second']}/s"
+        )
+        return metrics
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, TypedDict
+from app.ai_backend import AssistantBackend, AssistantMessage, get_assistant_backend
+
+"""
+Response cache in front of the AI assistant backend.
+
+Entries are keyed on the normalized latest prompt plus a hash of the
+preceding CONTEXT_WINDOW chat messages, so "make this shorter" only hits
+when it refers to the same draft. The in-memory LRU is bounded by
+AI_CACHE_MAX_ENTRIES and AI_CACHE_TTL_SECONDS; setting AI_CACHE_PATH also
+persists entries to a SQLite file that every worker on the host shares.
+"""
+
+CONTEXT_WINDOW = 4
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class CacheStats(TypedDict):
+    hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+
+
+def normalize_prompt(prompt: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", prompt).strip().lower().rstrip(".!?")
+
+
+def cache_key(messages: list[AssistantMessage], window: int = CONTEXT_WINDOW) -> str:
+    if not messages:
+        return ""
+    *history, latest = messages
+    context = json.dumps(
+        [[m["role"], m["content"]] for m in history[-window:]], ensure_ascii=False
+    )
+    digest = hashlib.sha256()
+    digest.update(normalize_prompt(latest["content"]).encode())
+    digest.update(b"\0")
+    digest.update(context.encode())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 24 * 3600,
+        path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        if path:
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, response TEXT)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _read_disk(self, key: str) -> tuple[float, str] | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT stored_at, response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _write_disk(self, key: str, stored_at: float, response: str):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, stored_at, response),
+            )
+            connection.execute(
+                "DELETE FROM responses WHERE stored_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+
+    def _remember(self, key: str, stored_at: float, response: str):
+        self._entries[key] = (stored_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[0] < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self._entries.pop(key, None)
+        if self.path:
+            try:
+                entry = await asyncio.to_thread(self._read_disk, key)
+            except sqlite3.Error as e:
+                logging.exception(f"AI cache read failed: {e}")
+                entry = None
+            if entry is not None and time.time() - entry[0] < self.ttl_seconds:
+                self._remember(key, *entry)
+                self.disk_hits += 1
+                return entry[1]
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, response: str):
+        stored_at = time.time()
+        self._remember(key, stored_at, response)
+        if self.path:
+            try:
+                await asyncio.to_thread(self._write_disk, key, stored_at, response)
+            except sqlite3.Error as e:
+                logging.exception(f"AI cache write failed: {e}")
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 3)
+            if lookups
+            else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+class CachedBackend(AssistantBackend):
+    def __init__(self, backend: AssistantBackend, cache: ResponseCache):
+        self.backend = backend
+        self.cache = cache
+        self.name = f"cached:{backend.name}"
+
+    async def stream(self, messages: list[AssistantMessage]) -> AsyncIterator[str]:
+        key = cache_key(messages)
+        cached = await self.cache.get(key)
+        stats = self.cache.stats()
+        if cached is not None:
+            logging.info(f"AI cache hit (hit rate {stats['hit_rate']:.0%})")
+            for index, word in enumerate(cached.split(" ")):
+                yield word if index == 0 else f" {word}"
+            return
+        logging.info(f"AI cache miss (hit rate {stats['hit_rate']:.0%})")
+        tokens = []
+        async for token in self.backend.stream(messages):
+            tokens.append(token)
+            yield token
+        if tokens:
+            await self.cache.set(key, "".join(tokens))
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("AI_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.environ.get("AI_CACHE_TTL_SECONDS", str(24 * 3600))),
+    path=os.environ.get("AI_CACHE_PATH") or None,
+)
+
+assistant_backend = CachedBackend(get_assistant_backend(), response_cache)
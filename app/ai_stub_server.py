@@ -0,0 +1,73 @@
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+Local stub of an OpenAI-compatible streaming chat completions API.
+
+Point the assistant at it with AI_BACKEND_URL=http://127.0.0.1:8765 to
+exercise token streaming without a real model:
+
+    python -m app.ai_stub_server --port 8765 --first-token-delay 0.3 --token-delay 0.02
+"""
+
+
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    first_token_delay = 0.3
+    token_delay = 0.02
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        messages = payload.get("messages", [])
+        prompt = next(
+            (m["content"] for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        words = (
+            f"Here is a LinkedIn post about {prompt}. Lead with a concrete "
+            "insight, share one story from your own work, and close with a "
+            "question for your network. #Learning #Growth"
+        ).split(" ")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        time.sleep(self.first_token_delay)
+        for index, word in enumerate(words):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": payload.get("model", "stub"),
+                "choices": [
+                    {"index": 0, "delta": {"content": word if index == 0 else f" {word}"}}
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local streaming model stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    args = parser.parse_args()
+    StubCompletionHandler.first_token_delay = args.first_token_delay
+    StubCompletionHandler.token_delay = args.token_delay
+    server = ThreadingHTTPServer((args.host, args.port), StubCompletionHandler)
+    print(f"AI stub server listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,13 @@ from app.components.dashboard import dashboard_page
 from app.components.create_post import create_post_page
 from app.components.management import management_page
 from app.components.analytics import analytics_page
+from app.components.performance import performance_page
 from app.states.state import DashboardState
 from app.states.create_post_state import CreatePostState
 from app.states.management_state import ManagementState
 from app.states.analytics_state import AnalyticsState
+from app.states.performance_state import PerformanceState
+from app.lifespan import run_background_services
 
 
 def index() -> rx.Component:
@@ -43,6 +46,14 @@ def analytics() -> rx.Component:
     )
 
 
+def performance() -> rx.Component:
+    return rx.el.div(
+        sidebar(),
+        performance_page(),
+        class_name="flex min-h-screen w-full font-['Roboto'] bg-stone-100",
+    )
+
+
 def settings() -> rx.Component:
     return rx.el.div(
         sidebar(),
@@ -66,8 +77,12 @@ app = rxe.App(
         ),
     ],
 )
+app.register_lifespan_task(run_background_services, rx_app=app)
 app.add_page(index, on_load=DashboardState.on_load)
 app.add_page(create_post, route="/create-post", on_load=CreatePostState.on_load_posts)
 app.add_page(management, route="/management", on_load=ManagementState.on_load_posts)
 app.add_page(analytics, route="/analytics", on_load=AnalyticsState.on_load_analytics)
+app.add_page(
+    performance, route="/performance", on_load=PerformanceState.on_load_performance
+)
 app.add_page(settings, route="/settings")
\ No newline at end of file
@@ -0,0 +1,105 @@
+import datetime
+import logging
+from typing import Any, Iterator
+from sqlalchemy import text
+from app.database import db_session
+from app.post_repository import post_repository
+from app.post_scheduler import post_scheduler
+
+"""
+Set-based bulk operations on posts.
+
+Every action is one statement per batch of ids (`WHERE id = ANY(:ids)`),
+committed per batch so very large selections never hold locks on more than
+BULK_BATCH_SIZE rows at a time. Each function returns the ids the database
+actually changed so callers can patch their local state instead of
+refetching. If a batch fails, the batches already committed stay committed;
+the error is raised as a BulkActionError carrying their ids.
+"""
+
+BULK_BATCH_SIZE = 1000
+BULK_STATUSES = ("Published", "Draft", "Archived")
+
+
+class BulkActionError(Exception):
+    def __init__(self, changed: list[int]):
+        super().__init__(f"Bulk action failed after changing {len(changed)} post(s)")
+        self.changed = changed
+
+
+def _batches(ids: list[int], batch_size: int) -> Iterator[list[int]]:
+    for start in range(0, len(ids), batch_size):
+        yield ids[start : start + batch_size]
+
+
+async def _run_batched(sql: str, ids: list[int], params: dict[str, Any]) -> list[int]:
+    changed = []
+    if not ids:
+        return changed
+    try:
+        async with db_session() as session:
+            for batch in _batches(sorted(set(ids)), BULK_BATCH_SIZE):
+                result = await session.execute(
+                    text(sql), {**params, "ids": batch}
+                )
+                batch_changed = result.scalars().all()
+                await session.commit()
+                changed.extend(batch_changed)
+    except Exception as e:
+        raise BulkActionError(changed) from e
+    finally:
+        if changed:
+            post_repository.invalidate()
+    logging.info(f"Bulk action changed {len(changed)} of {len(ids)} post(s)")
+    return changed
+
+
+async def set_posts_status(ids: list[int], status: str) -> list[int]:
+    if status not in BULK_STATUSES:
+        raise ValueError(f"Unsupported status: {status}")
+    return await _run_batched(
+        """
+            UPDATE posts SET status = CAST(:status AS post_status)
+            WHERE id = ANY(CAST(:ids AS bigint[])) AND status <> CAST(:status AS post_status)
+            RETURNING id
+        """,
+        ids,
+        {"status": status},
+    )
+
+
+async def archive_posts(ids: list[int]) -> list[int]:
+    return await set_posts_status(ids, "Archived")
+
+
+async def delete_posts(ids: list[int]) -> list[int]:
+    return await _run_batched(
+        "DELETE FROM posts WHERE id = ANY(CAST(:ids AS bigint[])) RETURNING id",
+        ids,
+        {},
+    )
+
+
+async def reschedule_posts(
+    ids: list[int], scheduled_at: datetime.datetime
+) -> list[int]:
+    if scheduled_at <= datetime.datetime.now(datetime.timezone.utc):
+        raise ValueError("Posts can only be rescheduled to a future time")
+    try:
+        changed = await _run_batched(
+            """
+                UPDATE posts
+                SET status = 'Scheduled', scheduled_at = :scheduled_at, publication_date = :publication_date
+                WHERE id = ANY(CAST(:ids AS bigint[]))
+                RETURNING id
+            """,
+            ids,
+            {"scheduled_at": scheduled_at, "publication_date": scheduled_at.date()},
+        )
+    except BulkActionError as e:
+        for post_id in e.changed:
+            post_scheduler.schedule(post_id, scheduled_at)
+        raise
+    for post_id in changed:
+        post_scheduler.schedule(post_id, scheduled_at)
+    return changed
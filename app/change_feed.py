@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Awaitable, Callable
+import asyncpg
+import reflex as rx
+from app.database import async_database_url, uses_postgres
+from app.models import Post
+from app.post_repository import post_repository
+from app.post_scheduler import post_scheduler
+
+"""
+Live post updates pushed from Postgres.
+
+Statement-level triggers on `posts` (migration 0008) NOTIFY the
+`posts_changes` channel with the op and the affected ids. Each worker runs
+one LISTEN connection; notifications are coalesced for
+CHANGE_FEED_COALESCE seconds, the upserted rows are fetched once with a
+single `id = ANY(...)` query, and the batch is fanned out to every open
+session on this worker that subscribed on page load. Each subscribed state
+class implements `apply_post_changes(posts, deleted_ids)` to patch itself
+incrementally; the resulting delta is pushed to the browser by
+`app.modify_state`. `push_to_sessions` reuses the same registry for other
+server-side updates, such as database status changes.
+"""
+
+CHANNEL = "posts_changes"
+COALESCE_SECONDS = float(os.environ.get("CHANGE_FEED_COALESCE", "0.2"))
+RECONNECT_SECONDS = 5.0
+
+_subscribers: dict[type[rx.State], set[str]] = defaultdict(set)
+
+
+def subscribe(state: rx.State):
+    _subscribers[type(state)].add(state.router.session.client_token)
+
+
+def _connected_tokens(rx_app: rx.App) -> set[str]:
+    event_namespace = rx_app.event_namespace
+    if event_namespace is None:
+        return set()
+    return set(event_namespace.token_to_sid)
+
+
+async def _push(
+    rx_app: rx.App,
+    token: str,
+    state_cls: type[rx.State],
+    update: Callable[[rx.State], Awaitable[None]],
+):
+    try:
+        async with rx_app.modify_state(
+            f"{token}_{state_cls.get_full_name()}"
+        ) as root_state:
+            await update(await root_state.get_state(state_cls))
+    except Exception as e:
+        logging.exception(f"Could not push an update to {state_cls.__name__}: {e}")
+
+
+async def push_to_sessions(
+    rx_app: rx.App,
+    state_cls: type[rx.State],
+    update: Callable[[rx.State], Awaitable[None]],
+):
+    connected = _connected_tokens(rx_app)
+    tokens: set[str] = set()
+    for subscribed in _subscribers.values():
+        subscribed &= connected
+        tokens |= subscribed
+    for token in tokens:
+        await _push(rx_app, token, state_cls, update)
+
+
+class ChangeFeed:
+    def __init__(self, rx_app: rx.App):
+        self.rx_app = rx_app
+        self._upserted: set[int] = set()
+        self._deleted: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    def on_notification(self, connection, pid, channel, payload: str):
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            logging.warning(f"Ignoring malformed {CHANNEL} payload: {payload[:200]}")
+            return
+        ids = set(change.get("ids") or [])
+        if change.get("op") == "delete":
+            self._deleted |= ids
+            self._upserted -= ids
+        else:
+            self._upserted |= ids
+            self._deleted -= ids
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        while self._upserted or self._deleted:
+            await asyncio.sleep(COALESCE_SECONDS)
+            upserted, deleted = list(self._upserted), list(self._deleted)
+            self._upserted, self._deleted = set(), set()
+            try:
+                post_repository.invalidate()
+                posts = await post_repository.fetch_posts_by_ids(upserted)
+                await post_scheduler.refresh(upserted)
+                await self.fan_out(posts, deleted)
+            except Exception as e:
+                logging.exception(f"Change feed fan-out failed: {e}")
+
+    async def fan_out(self, posts: list[Post], deleted_ids: list[int]):
+        connected = _connected_tokens(self.rx_app)
+        for state_cls, tokens in _subscribers.items():
+            tokens &= connected
+            for token in list(tokens):
+                await _push(
+                    self.rx_app,
+                    token,
+                    state_cls,
+                    lambda state: state.apply_post_changes(
+                        [dict(p) for p in posts], deleted_ids
+                    ),
+                )
+
+    async def listen(self):
+        if not uses_postgres():
+            logging.info("Change feed disabled: the database is not Postgres")
+            return
+        dsn = async_database_url().replace("postgresql+asyncpg://", "postgresql://")
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                await connection.add_listener(CHANNEL, self.on_notification)
+                post_scheduler.reset()
+                logging.info(f"Listening for post changes on {CHANNEL}")
+                while not connection.is_closed():
+                    await asyncio.sleep(RECONNECT_SECONDS)
+            except Exception as e:
+                logging.exception(f"Change feed connection failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+async def run_change_feed(rx_app: rx.App):
+    await ChangeFeed(rx_app).listen()
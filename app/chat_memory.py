@@ -0,0 +1,59 @@
+import re
+from app.ai_backend import AssistantMessage
+
+"""
+Bounded conversation memory for the AI assistant.
+
+Only a sliding window of recent messages is kept in the synced
+`chat_history` var; it is capped both by message count and by an
+approximate token budget. Messages that fall out of the window are
+archived server-side and folded into a short extractive summary that is
+sent to the model as context instead of the full conversation.
+"""
+
+MAX_WINDOW_MESSAGES = 12
+MAX_WINDOW_TOKENS = 1500
+MAX_SUMMARY_TOKENS = 200
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def window_tokens(messages: list[AssistantMessage]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def split_window(
+    messages: list[AssistantMessage],
+) -> tuple[list[AssistantMessage], list[AssistantMessage]]:
+    window = list(messages)
+    archived = []
+    while len(window) > 1 and (
+        len(window) > MAX_WINDOW_MESSAGES or window_tokens(window) > MAX_WINDOW_TOKENS
+    ):
+        archived.append(window.pop(0))
+    return archived, window
+
+
+def summarize(summary: str, archived: list[AssistantMessage]) -> str:
+    points = [summary] if summary else []
+    for message in archived:
+        first_sentence = SENTENCE_PATTERN.split(message["content"].strip(), 1)[0]
+        speaker = "User asked" if message["role"] == "user" else "Assistant wrote"
+        points.append(f"{speaker}: {first_sentence[:160]}")
+    while len(points) > 1 and estimate_tokens(" ".join(points)) > MAX_SUMMARY_TOKENS:
+        points.pop(0)
+    return " ".join(points)
+
+
+def build_model_messages(
+    summary: str, window: list[AssistantMessage]
+) -> list[AssistantMessage]:
+    messages = [{"role": m["role"], "content": m["content"]} for m in window]
+    if summary:
+        messages.insert(
+            0, {"role": "system", "content": f"Earlier in this conversation: {summary}"}
+        )
+    return messages
@@ -22,7 +22,8 @@ def trend_chart() -> rx.Component:
                 lambda item: rx.el.div(
                     rx.el.div(
                         rx.el.div(class_name="w-full h-full bg-cyan-500 rounded-t-md"),
-                        style={"height": item["interactions"].to_string() + "%"},
+                        style={"height": item["height"].to_string() + "%"},
+                        title=item["interactions"].to_string(),
                         class_name="w-full h-full flex flex-col justify-end",
                     ),
                     rx.el.p(
@@ -49,33 +50,79 @@ def top_post_card(post: rx.Var[dict], rank: int) -> rx.Component:
             class_name="flex items-center gap-4",
         ),
         rx.el.div(
-            rx.el.p(
-                post["engagement_rate"].to_string() + "%",
-                class_name="font-bold text-lg",
+            rx.match(
+                AnalyticsState.top_metric,
+                (
+                    "likes",
+                    rx.fragment(
+                        rx.el.p(post["likes"], class_name="font-bold text-lg"),
+                        rx.el.p("Likes", class_name="text-xs text-stone-500"),
+                    ),
+                ),
+                (
+                    "comments",
+                    rx.fragment(
+                        rx.el.p(post["comments"], class_name="font-bold text-lg"),
+                        rx.el.p("Comments", class_name="text-xs text-stone-500"),
+                    ),
+                ),
+                rx.fragment(
+                    rx.el.p(
+                        post["engagement_rate"].to_string() + "%",
+                        class_name="font-bold text-lg",
+                    ),
+                    rx.el.p("Engagement", class_name="text-xs text-stone-500"),
+                ),
             ),
-            rx.el.p("Engagement", class_name="text-xs text-stone-500"),
             class_name="text-right",
         ),
         class_name="flex items-center justify-between p-3 bg-white rounded-lg border hover:bg-stone-50",
     )
 
 
-def analytics_page() -> rx.Component:
-    return rx.el.main(
+def post_picker() -> rx.Component:
+    return rx.el.div(
         rx.el.div(
-            rx.el.h1("Post Analytics", class_name="text-3xl font-bold text-stone-800"),
-            rx.el.select(
+            rx.icon("search", class_name="h-4 w-4 text-stone-400"),
+            rx.debounce_input(
+                rx.el.input(
+                    placeholder=rx.cond(
+                        AnalyticsState.selected_post,
+                        AnalyticsState.selected_post["content"].to_string()[:50]
+                        + "...",
+                        "Search published posts...",
+                    ),
+                    value=AnalyticsState.post_query,
+                    on_change=AnalyticsState.set_post_query,
+                    class_name="bg-transparent w-full focus:outline-none text-sm",
+                ),
+                debounce_timeout=300,
+            ),
+            class_name="flex items-center gap-2 p-2 border rounded-lg bg-white shadow-sm",
+        ),
+        rx.cond(
+            AnalyticsState.post_query != "",
+            rx.el.div(
                 rx.foreach(
-                    AnalyticsState.posts,
-                    lambda post: rx.el.option(
-                        post["content"].to_string()[:50] + "...",
-                        value=post["id"].to_string(),
+                    AnalyticsState.post_suggestions,
+                    lambda option: rx.el.button(
+                        option["label"] + "...",
+                        on_click=AnalyticsState.select_post(option["id"]),
+                        class_name="w-full text-left text-sm px-3 py-2 truncate hover:bg-stone-100",
                     ),
                 ),
-                on_change=AnalyticsState.select_post,
-                value=AnalyticsState.selected_post_id,
-                class_name="mt-4 w-full max-w-md p-2 border rounded-lg bg-white shadow-sm",
+                class_name="absolute z-10 mt-1 w-full bg-white border rounded-lg shadow-md overflow-hidden",
             ),
+        ),
+        class_name="relative mt-4 w-full max-w-md",
+    )
+
+
+def analytics_page() -> rx.Component:
+    return rx.el.main(
+        rx.el.div(
+            rx.el.h1("Post Analytics", class_name="text-3xl font-bold text-stone-800"),
+            post_picker(),
             class_name="mb-6",
         ),
         rx.cond(
@@ -109,8 +156,29 @@ def analytics_page() -> rx.Component:
                 rx.el.div(
                     trend_chart(),
                     rx.el.div(
-                        rx.el.h3(
-                            "Top 3 Posts by Engagement", class_name="font-semibold mb-4"
+                        rx.el.div(
+                            rx.el.h3("Top 3 Posts", class_name="font-semibold"),
+                            rx.el.div(
+                                rx.el.select(
+                                    rx.el.option("All time", value="0"),
+                                    rx.el.option("Last 7 days", value="7"),
+                                    rx.el.option("Last 30 days", value="30"),
+                                    rx.el.option("Last 90 days", value="90"),
+                                    value=AnalyticsState.top_window_days.to_string(),
+                                    on_change=AnalyticsState.set_top_window_days,
+                                    class_name="text-sm p-1 border rounded-md bg-white",
+                                ),
+                                rx.el.select(
+                                    rx.el.option("Engagement", value="engagement_rate"),
+                                    rx.el.option("Likes", value="likes"),
+                                    rx.el.option("Comments", value="comments"),
+                                    value=AnalyticsState.top_metric,
+                                    on_change=AnalyticsState.set_top_metric,
+                                    class_name="text-sm p-1 border rounded-md bg-white",
+                                ),
+                                class_name="flex items-center gap-2",
+                            ),
+                            class_name="flex items-center justify-between mb-4",
                         ),
                         rx.el.div(
                             rx.foreach(
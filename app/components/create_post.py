@@ -2,18 +2,42 @@ import reflex as rx
 from app.states.create_post_state import CreatePostState
 
 
-def media_preview(url: str) -> rx.Component:
+def media_preview(asset: rx.Var[dict]) -> rx.Component:
     return rx.el.div(
-        rx.el.image(src=url, class_name="w-24 h-24 object-cover rounded-lg"),
+        rx.cond(
+            asset["thumbnail_url"] != "",
+            rx.el.image(
+                src=asset["thumbnail_url"],
+                loading="lazy",
+                class_name="w-24 h-24 object-cover rounded-lg",
+            ),
+            rx.el.div(
+                rx.icon("film", class_name="h-8 w-8 text-stone-400"),
+                class_name="w-24 h-24 flex items-center justify-center rounded-lg bg-stone-100",
+            ),
+        ),
         rx.el.button(
             rx.icon("x", class_name="h-4 w-4"),
-            on_click=lambda: CreatePostState.remove_media(url),
+            on_click=lambda: CreatePostState.remove_media(asset["url"]),
             class_name="absolute top-1 right-1 bg-black/50 text-white rounded-full p-0.5 hover:bg-black/75",
         ),
         class_name="relative",
     )
 
 
+def upload_progress_item(item: rx.Var[dict]) -> rx.Component:
+    return rx.el.div(
+        rx.match(
+            item["status"],
+            ("done", rx.icon("circle_check", class_name="h-4 w-4 text-green-500")),
+            ("error", rx.icon("circle_x", class_name="h-4 w-4 text-red-500")),
+            rx.spinner(class_name="h-4 w-4 text-cyan-600"),
+        ),
+        rx.el.span(item["file_name"], class_name="truncate"),
+        class_name="flex items-center gap-2 text-sm text-stone-600",
+    )
+
+
 def ai_assistant() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -30,6 +54,14 @@ def ai_assistant() -> rx.Component:
             class_name="flex items-center justify-between p-4 border-b",
         ),
         rx.el.div(
+            rx.cond(
+                CreatePostState.archived_message_count > 0,
+                rx.el.p(
+                    f"{CreatePostState.archived_message_count} earlier messages summarized",
+                    class_name="text-xs text-center text-stone-400",
+                ),
+                None,
+            ),
             rx.foreach(
                 CreatePostState.chat_history,
                 lambda message: rx.el.div(
@@ -41,8 +73,24 @@ def ai_assistant() -> rx.Component:
                     ),
                 ),
             ),
+            rx.cond(
+                CreatePostState.ai_processing & (CreatePostState.ai_response != ""),
+                rx.el.div(
+                    rx.el.p(CreatePostState.ai_response),
+                    class_name="bg-stone-100 text-stone-900 p-3 rounded-lg self-start",
+                ),
+                None,
+            ),
             class_name="flex-1 p-4 space-y-4 overflow-y-auto",
         ),
+        rx.cond(
+            CreatePostState.ai_metrics["tokens"] > 0,
+            rx.el.p(
+                f"First token {CreatePostState.ai_metrics['ttft_ms']} ms · {CreatePostState.ai_metrics['tokens_per_second']} tokens/s",
+                class_name="px-4 text-xs text-stone-400",
+            ),
+            None,
+        ),
         rx.el.div(
             rx.el.div(
                 rx.el.input(
@@ -157,9 +205,19 @@ def create_post_page() -> rx.Component:
                     None,
                 ),
                 rx.cond(
-                    CreatePostState.uploaded_media_urls.length() > 0,
+                    CreatePostState.upload_progress.length() > 0,
+                    rx.el.div(
+                        rx.foreach(
+                            CreatePostState.upload_progress, upload_progress_item
+                        ),
+                        class_name="mt-4 space-y-1",
+                    ),
+                    None,
+                ),
+                rx.cond(
+                    CreatePostState.uploaded_media.length() > 0,
                     rx.el.div(
-                        rx.foreach(CreatePostState.uploaded_media_urls, media_preview),
+                        rx.foreach(CreatePostState.uploaded_media, media_preview),
                         class_name="flex flex-wrap gap-4 mt-4",
                     ),
                     None,
@@ -173,10 +231,22 @@ def create_post_page() -> rx.Component:
                     class_name="px-6 py-2 border border-stone-300 rounded-lg font-semibold hover:bg-stone-100",
                 ),
                 rx.el.div(
-                    rx.el.input(type="date", class_name="border rounded-lg px-3 py-2"),
-                    rx.el.input(type="time", class_name="border rounded-lg px-3 py-2"),
+                    rx.el.input(
+                        type="date",
+                        value=CreatePostState.schedule_date,
+                        on_change=CreatePostState.set_schedule_date,
+                        class_name="border rounded-lg px-3 py-2",
+                    ),
+                    rx.el.input(
+                        type="time",
+                        value=CreatePostState.schedule_time,
+                        on_change=CreatePostState.set_schedule_time,
+                        class_name="border rounded-lg px-3 py-2",
+                    ),
+                    rx.el.span("UTC", class_name="text-sm text-stone-500"),
                     rx.el.button(
                         "Schedule",
+                        on_click=CreatePostState.schedule_post,
                         class_name="px-6 py-2 bg-blue-600 text-white rounded-lg font-semibold hover:bg-blue-700",
                     ),
                     class_name="flex items-center gap-2",
@@ -46,6 +46,14 @@ def status_badge(status: rx.Var[str]) -> rx.Component:
                 class_name="inline-flex items-center rounded-full bg-blue-100 px-2.5 py-0.5 text-xs font-semibold text-blue-800 w-fit",
             ),
         ),
+        (
+            "Archived",
+            rx.el.div(
+                rx.icon("archive", class_name="h-3 w-3 mr-1.5"),
+                "Archived",
+                class_name="inline-flex items-center rounded-full bg-stone-200 px-2.5 py-0.5 text-xs font-semibold text-stone-700 w-fit",
+            ),
+        ),
         rx.el.div(
             "Unknown",
             class_name="inline-flex items-center rounded-full bg-stone-100 px-2.5 py-0.5 text-xs font-semibold text-stone-800 w-fit",
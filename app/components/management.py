@@ -1,6 +1,7 @@
 import reflex as rx
 from app.states.management_state import ManagementState
 from app.components.dashboard import status_badge
+from app.post_repository import MANAGEMENT_PREVIEW_LENGTH, SEARCH_RESULT_LIMIT
 
 
 def filter_pill(status: str) -> rx.Component:
@@ -19,9 +20,24 @@ def filter_pill(status: str) -> rx.Component:
 def post_card(post: rx.Var[dict]) -> rx.Component:
     return rx.el.div(
         rx.el.div(
+            rx.el.input(
+                type="checkbox",
+                checked=ManagementState.selected_post_ids.contains(post["id"]),
+                on_change=lambda _: ManagementState.toggle_post_selection(post["id"]),
+                class_name="h-4 w-4 mb-3 accent-cyan-600",
+            ),
             rx.el.p(
-                post["content"].to_string()[:150] + "...",
-                class_name="text-sm text-stone-700 leading-relaxed",
+                rx.cond(
+                    ManagementState.opened_post["id"] == post["id"],
+                    ManagementState.opened_post["content"],
+                    rx.cond(
+                        post["content"].to(str).length() >= MANAGEMENT_PREVIEW_LENGTH,
+                        post["content"].to(str) + "...",
+                        post["content"].to(str),
+                    ),
+                ),
+                on_click=lambda: ManagementState.open_post(post["id"]),
+                class_name="text-sm text-stone-700 leading-relaxed cursor-pointer whitespace-pre-wrap",
             ),
             rx.el.div(
                 status_badge(post["status"]),
@@ -57,28 +73,129 @@ def post_card(post: rx.Var[dict]) -> rx.Component:
     )
 
 
+def bulk_actions_bar() -> rx.Component:
+    button_class = "px-3 py-1.5 text-sm font-medium bg-white border border-stone-300 rounded-md hover:bg-stone-50"
+    return rx.el.div(
+        rx.el.p(
+            ManagementState.selected_count.to_string() + " selected",
+            class_name="text-sm font-semibold text-stone-700",
+        ),
+        rx.el.button(
+            "Select page", on_click=ManagementState.select_page, class_name=button_class
+        ),
+        rx.el.button(
+            "Clear", on_click=ManagementState.clear_selection, class_name=button_class
+        ),
+        rx.el.div(
+            rx.el.button(
+                rx.icon("archive", class_name="h-4 w-4 mr-2"),
+                "Archive",
+                on_click=ManagementState.bulk_archive,
+                class_name=f"flex items-center {button_class}",
+            ),
+            rx.el.select(
+                rx.el.option("Published", value="Published"),
+                rx.el.option("Draft", value="Draft"),
+                rx.el.option("Archived", value="Archived"),
+                value=ManagementState.bulk_status,
+                on_change=ManagementState.set_bulk_status,
+                class_name="p-1.5 text-sm border rounded-md bg-white",
+            ),
+            rx.el.button(
+                "Set Status",
+                on_click=ManagementState.bulk_change_status,
+                class_name=button_class,
+            ),
+            rx.el.input(
+                type="date",
+                value=ManagementState.bulk_schedule_date,
+                on_change=ManagementState.set_bulk_schedule_date,
+                class_name="p-1.5 text-sm border rounded-md",
+            ),
+            rx.el.input(
+                type="time",
+                value=ManagementState.bulk_schedule_time,
+                on_change=ManagementState.set_bulk_schedule_time,
+                class_name="p-1.5 text-sm border rounded-md",
+            ),
+            rx.el.span("UTC", class_name="text-xs text-stone-500"),
+            rx.el.button(
+                rx.icon("clock", class_name="h-4 w-4 mr-2"),
+                "Reschedule",
+                on_click=ManagementState.bulk_reschedule,
+                class_name=f"flex items-center {button_class}",
+            ),
+            rx.el.button(
+                rx.icon("trash-2", class_name="h-4 w-4 mr-2"),
+                "Delete",
+                on_click=ManagementState.bulk_delete,
+                class_name="flex items-center px-3 py-1.5 text-sm font-medium text-red-600 bg-white border border-red-200 rounded-md hover:bg-red-50",
+            ),
+            class_name="flex flex-wrap items-center gap-2 ml-auto",
+        ),
+        class_name="flex flex-wrap items-center gap-3 p-3 mb-6 bg-cyan-50 border border-cyan-200 rounded-xl",
+    )
+
+
 def management_page() -> rx.Component:
     return rx.el.main(
         rx.el.h1("Post Management", class_name="text-3xl font-bold text-stone-800"),
         rx.el.div(
             rx.el.div(
-                rx.foreach(["All", "Published", "Draft", "Scheduled"], filter_pill),
+                rx.foreach(
+                    ["All", "Published", "Draft", "Scheduled", "Archived"], filter_pill
+                ),
                 class_name="flex items-center gap-2",
             ),
             rx.el.div(
                 rx.icon("search", class_name="h-5 w-5 text-stone-400"),
-                rx.el.input(
-                    placeholder="Search posts...",
-                    on_change=ManagementState.set_search_query,
-                    class_name="bg-transparent w-full focus:outline-none text-sm",
+                rx.debounce_input(
+                    rx.el.input(
+                        placeholder="Search posts...",
+                        on_change=ManagementState.set_search_query,
+                        class_name="bg-transparent w-full focus:outline-none text-sm",
+                    ),
+                    debounce_timeout=300,
                 ),
                 class_name="flex items-center gap-2 px-4 py-2 bg-white border border-stone-200 rounded-full w-full max-w-xs",
             ),
             class_name="flex justify-between items-center mt-6 mb-6",
         ),
+        rx.cond(ManagementState.selected_count > 0, bulk_actions_bar()),
+        rx.cond(
+            ManagementState.search_truncated,
+            rx.el.p(
+                f"Showing the top {SEARCH_RESULT_LIMIT} matches. Refine your search to see the rest.",
+                class_name="mb-4 text-sm text-stone-500",
+            ),
+        ),
         rx.el.div(
-            rx.foreach(ManagementState.filtered_posts, post_card),
+            rx.foreach(ManagementState.page_posts, post_card),
             class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6",
         ),
+        rx.el.div(
+            rx.el.p(
+                f"Page {ManagementState.current_page}",
+                class_name="text-sm text-stone-600",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    rx.icon("chevron-left", class_name="h-4 w-4"),
+                    "Prev",
+                    on_click=ManagementState.prev_page,
+                    disabled=ManagementState.current_page <= 1,
+                    class_name="flex items-center gap-1 px-3 py-1.5 text-sm font-medium text-stone-700 bg-white border border-stone-300 rounded-md hover:bg-stone-50 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                rx.el.button(
+                    "Next",
+                    rx.icon("chevron-right", class_name="h-4 w-4"),
+                    on_click=ManagementState.next_page,
+                    disabled=~ManagementState.has_next_page,
+                    class_name="flex items-center gap-1 px-3 py-1.5 text-sm font-medium text-stone-700 bg-white border border-stone-300 rounded-md hover:bg-stone-50 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                class_name="flex items-center gap-2",
+            ),
+            class_name="flex items-center justify-between mt-6",
+        ),
         class_name="p-6 flex-1",
     )
\ No newline at end of file
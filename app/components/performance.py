@@ -0,0 +1,174 @@
+import reflex as rx
+from app.states.performance_state import PerformanceState
+
+
+def stats_header(title: str) -> rx.Component:
+    return rx.el.th(
+        title,
+        class_name="px-4 py-3 text-left text-xs font-semibold uppercase tracking-wider text-stone-500",
+    )
+
+
+def stats_table(stats: rx.Var[list[dict]]) -> rx.Component:
+    return rx.el.div(
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    stats_header("Query"),
+                    stats_header("Calls"),
+                    stats_header("Total (ms)"),
+                    stats_header("Mean (ms)"),
+                    stats_header("Rows"),
+                    stats_header("Cache Hit"),
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(
+                    stats,
+                    lambda stat: rx.el.tr(
+                        rx.el.td(
+                            rx.el.p(
+                                stat["query"],
+                                title=stat["query"],
+                                class_name="font-mono text-xs text-stone-800 truncate max-w-xl",
+                            ),
+                            class_name="px-4 py-3",
+                        ),
+                        rx.el.td(stat["calls"], class_name="px-4 py-3 text-stone-600"),
+                        rx.el.td(
+                            stat["total_exec_ms"], class_name="px-4 py-3 text-stone-600"
+                        ),
+                        rx.el.td(
+                            stat["mean_exec_ms"], class_name="px-4 py-3 text-stone-600"
+                        ),
+                        rx.el.td(stat["rows"], class_name="px-4 py-3 text-stone-600"),
+                        rx.el.td(
+                            stat["cache_hit_pct"].to_string() + "%",
+                            class_name=rx.cond(
+                                stat["cache_hit_pct"] < 99,
+                                "px-4 py-3 font-semibold text-red-600",
+                                "px-4 py-3 text-stone-600",
+                            ),
+                        ),
+                        class_name="border-b border-stone-200 hover:bg-stone-50 transition-colors",
+                    ),
+                ),
+                class_name="bg-white",
+            ),
+            class_name="min-w-full text-sm",
+        ),
+        class_name="overflow-x-auto",
+    )
+
+
+def snapshot_controls() -> rx.Component:
+    return rx.el.div(
+        rx.el.input(
+            placeholder="Snapshot label, e.g. before deploy",
+            value=PerformanceState.snapshot_label,
+            on_change=PerformanceState.set_snapshot_label,
+            class_name="flex-1 p-2 text-sm border rounded-lg bg-white",
+        ),
+        rx.el.button(
+            rx.icon("camera", class_name="h-4 w-4 mr-2"),
+            "Take Snapshot",
+            on_click=PerformanceState.save_snapshot,
+            class_name="flex items-center px-4 py-2 text-sm font-semibold text-white bg-cyan-600 rounded-lg hover:bg-cyan-700",
+        ),
+        rx.el.select(
+            rx.el.option("Compare with snapshot...", value=""),
+            rx.foreach(
+                PerformanceState.snapshots,
+                lambda snapshot: rx.el.option(
+                    snapshot["label"] + " (" + snapshot["taken_at"] + ")",
+                    value=snapshot["id"].to_string(),
+                ),
+            ),
+            value=PerformanceState.baseline_snapshot_id,
+            on_change=PerformanceState.compare_with_snapshot,
+            class_name="p-2 text-sm border rounded-lg bg-white",
+        ),
+        rx.el.select(
+            rx.el.option("against current stats", value=""),
+            rx.foreach(
+                PerformanceState.snapshots,
+                lambda snapshot: rx.el.option(
+                    "against " + snapshot["label"] + " (" + snapshot["taken_at"] + ")",
+                    value=snapshot["id"].to_string(),
+                ),
+            ),
+            value=PerformanceState.against_snapshot_id,
+            on_change=PerformanceState.compare_against_snapshot,
+            disabled=PerformanceState.baseline_snapshot_id == "",
+            class_name="p-2 text-sm border rounded-lg bg-white disabled:opacity-50",
+        ),
+        rx.el.button(
+            "Reset Stats",
+            on_click=PerformanceState.reset_stats,
+            class_name="px-4 py-2 text-sm font-medium text-red-600 bg-white border border-red-200 rounded-lg hover:bg-red-50",
+        ),
+        class_name="flex flex-wrap items-center gap-3",
+    )
+
+
+def performance_page() -> rx.Component:
+    return rx.el.main(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h1("Performance", class_name="text-3xl font-bold text-stone-800"),
+                rx.cond(
+                    PerformanceState.is_loading,
+                    rx.icon(
+                        "loader-circle", class_name="h-5 w-5 text-cyan-600 animate-spin"
+                    ),
+                ),
+                class_name="flex items-center gap-3",
+            ),
+            rx.el.select(
+                rx.el.option("Total time", value="total_exec_time"),
+                rx.el.option("Mean time", value="mean_exec_time"),
+                rx.el.option("Calls", value="calls"),
+                rx.el.option("Rows", value="rows"),
+                rx.el.option("Cache hit ratio", value="cache_hit_ratio"),
+                value=PerformanceState.rank_by,
+                on_change=PerformanceState.set_rank_by,
+                class_name="p-2 text-sm border rounded-lg bg-white shadow-sm",
+            ),
+            class_name="flex items-center justify-between mb-6",
+        ),
+        rx.cond(
+            PerformanceState.error_message != "",
+            rx.el.div(
+                rx.icon("triangle-alert", class_name="h-5 w-5 text-orange-500"),
+                rx.el.p(PerformanceState.error_message, class_name="text-sm"),
+                class_name="flex items-center gap-3 p-4 mb-6 bg-orange-50 border border-orange-200 rounded-xl",
+            ),
+        ),
+        rx.el.div(
+            snapshot_controls(),
+            class_name="p-4 mb-6 bg-white rounded-xl border border-stone-200 shadow-sm",
+        ),
+        rx.cond(
+            PerformanceState.baseline_snapshot_id != "",
+            rx.el.div(
+                rx.el.h2(
+                    rx.cond(
+                        PerformanceState.against_snapshot_id == "",
+                        "Change Since Snapshot",
+                        "Change Between Snapshots",
+                    ),
+                    class_name="px-6 py-4 text-xl font-bold text-stone-800",
+                ),
+                stats_table(PerformanceState.diff_stats),
+                class_name="mb-6 bg-white rounded-xl border border-stone-200 shadow-sm overflow-hidden",
+            ),
+        ),
+        rx.el.div(
+            rx.el.h2(
+                "Heaviest Queries", class_name="px-6 py-4 text-xl font-bold text-stone-800"
+            ),
+            stats_table(PerformanceState.query_stats),
+            class_name="bg-white rounded-xl border border-stone-200 shadow-sm overflow-hidden",
+        ),
+        class_name="p-6 flex-1",
+    )
@@ -1,7 +1,6 @@
 import reflex as rx
 from app.states.state import DashboardState
 
-
 def nav_item(item: dict) -> rx.Component:
     is_active = item["label"].lower() == DashboardState.active_page.lower()
     return rx.el.a(
@@ -87,6 +86,7 @@ def sidebar() -> rx.Component:
                         ),
                     ),
                 ),
+                on_mount=DashboardState.sync_db_status,
                 class_name="mt-auto p-4 border-t border-stone-200",
             ),
             class_name="flex flex-col h-full",
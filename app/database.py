@@ -0,0 +1,216 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Literal, TypedDict
+import reflex as rx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+"""
+Async database engine with an explicitly tuned connection pool.
+
+`rx.asession()` builds its engine with Reflex defaults, so pool size,
+overflow, recycling and statement timeouts cannot be controlled. Every query
+in the app goes through `db_session()` instead, which uses this module's
+engine configured from the environment:
+
+    DB_POOL_SIZE            persistent connections per worker (default 10)
+    DB_MAX_OVERFLOW         extra connections under burst load (default 10)
+    DB_POOL_TIMEOUT         seconds to wait for a free connection (default 10)
+    DB_POOL_RECYCLE         recycle connections older than this (default 1800)
+    DB_POOL_PRE_PING        validate connections on checkout (default true)
+    DB_STATEMENT_TIMEOUT_MS server-side statement_timeout (default 15000)
+    DB_POOL_WARMUP          connections opened at startup (default 2)
+    DB_HEALTH_INTERVAL      seconds between health checks (default 10)
+
+The engine is created on first use. `warm_up_pool` and `run_health_checks`
+run as app lifespan tasks; the health checker keeps `health.status` current,
+reports each status change to its `on_change` callback (which pushes it to
+the sidebar indicator of open sessions) and logs the pool metrics collected
+by `db_session()`.
+"""
+
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() != "false"
+STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "15000"))
+POOL_WARMUP_CONNECTIONS = int(os.environ.get("DB_POOL_WARMUP", "2"))
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.environ.get("DB_HEALTH_INTERVAL", "10"))
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+
+
+class PoolMetrics(TypedDict):
+    size: int
+    checked_out: int
+    overflow: int
+    waiters: int
+    acquisitions: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class DatabaseHealth:
+    def __init__(self):
+        self.status: Literal["connected", "connecting", "error"] = "connecting"
+        self.last_checked: float | None = None
+        self.last_error = ""
+        self.waiters = 0
+        self.acquisitions = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float):
+        self.acquisitions += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+
+def async_database_url() -> str:
+    config = rx.config.get_config()
+    url = config.async_db_url or config.db_url or "sqlite:///reflex.db"
+    for sync_prefix, async_prefix in (
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+def uses_postgres() -> bool:
+    return async_database_url().startswith("postgresql")
+
+
+def _engine_args(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    args = {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT_SECONDS,
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+    if "asyncpg" in url:
+        args["connect_args"] = {
+            "server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}
+        }
+    return args
+
+
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+health = DatabaseHealth()
+
+
+def get_engine() -> AsyncEngine:
+    global _engine, _session_factory
+    if _engine is None:
+        url = async_database_url()
+        _engine = create_async_engine(url, **_engine_args(url))
+        _session_factory = async_sessionmaker(
+            _engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+        )
+    return _engine
+
+
+@contextlib.asynccontextmanager
+async def db_session() -> AsyncIterator[AsyncSession]:
+    get_engine()
+    async with _session_factory() as session:
+        health.waiters += 1
+        started = time.perf_counter()
+        try:
+            await session.connection()
+        finally:
+            health.waiters -= 1
+            health.record_wait(time.perf_counter() - started)
+        yield session
+
+
+def pool_metrics() -> PoolMetrics:
+    if _engine is None:
+        pool = None
+    else:
+        pool = _engine.pool
+    return {
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "waiters": health.waiters,
+        "acquisitions": health.acquisitions,
+        "avg_wait_ms": round(
+            health.total_wait_seconds * 1000 / health.acquisitions, 3
+        )
+        if health.acquisitions
+        else 0.0,
+        "max_wait_ms": round(health.max_wait_seconds * 1000, 3),
+    }
+
+
+async def check_health() -> bool:
+    try:
+        async with asyncio.timeout(HEALTH_CHECK_TIMEOUT_SECONDS):
+            async with get_engine().connect() as connection:
+                await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        if health.status != "error":
+            logging.exception(f"Database health check failed: {e}")
+        health.status = "error"
+        health.last_error = str(e)
+    else:
+        health.status = "connected"
+        health.last_error = ""
+    health.last_checked = time.time()
+    return health.status == "connected"
+
+
+async def warm_up_pool():
+    started = time.perf_counter()
+    connections = max(1, min(POOL_WARMUP_CONNECTIONS, POOL_SIZE))
+
+    async def open_connection():
+        async with db_session() as session:
+            await session.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(open_connection() for _ in range(connections)))
+        health.status = "connected"
+        logging.info(
+            f"Database pool warmed up with {connections} connections in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+    except Exception as e:
+        health.status = "error"
+        health.last_error = str(e)
+        logging.exception(f"Database pool warm-up failed: {e}")
+
+
+async def run_health_checks(
+    on_change: Callable[[str], Awaitable[None]] | None = None,
+):
+    reported = health.status
+    while True:
+        await check_health()
+        if on_change is not None and health.status != reported:
+            reported = health.status
+            try:
+                await on_change(reported)
+            except Exception as e:
+                logging.exception(f"Could not report database status change: {e}")
+        metrics = pool_metrics()
+        log = logging.warning if metrics["waiters"] else logging.debug
+        log(
+            f"Database pool: {metrics['checked_out']}/{metrics['size']} checked out, "
+            f"overflow={metrics['overflow']} waiters={metrics['waiters']} "
+            f"avg_wait={metrics['avg_wait_ms']}ms max_wait={metrics['max_wait_ms']}ms"
+        )
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL_SECONDS)
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+import reflex as rx
+from app.change_feed import push_to_sessions, run_change_feed
+from app.database import run_health_checks, warm_up_pool
+from app.metrics_store import run_rollup_job
+from app.post_repository import run_tombstone_sweep
+from app.post_scheduler import run_post_scheduler
+from app.schema_migrations import run_migrations
+from app.states.state import DashboardState
+
+"""
+Startup and background jobs, registered as a single lifespan task.
+
+Reflex keeps lifespan tasks in a set, so separately registered tasks start
+in no particular order. Everything here runs in a fixed order instead:
+migrations are applied first (the app does not serve until they finish),
+then the pool is warmed up, then the long-running jobs are started. Jobs
+that read tables or columns added by migrations only start once the schema
+is known to be current; in offline mode only the health checks run.
+
+Database status changes are pushed to the sidebar indicator of every
+subscribed session, so the browser does not poll for them.
+"""
+
+
+@contextlib.asynccontextmanager
+async def run_background_services(rx_app: rx.App):
+    schema_ready = await run_migrations()
+    await warm_up_pool()
+
+    async def push_db_status(status: str):
+        async def update(state: DashboardState):
+            state.db_connection_status = status
+
+        await push_to_sessions(rx_app, DashboardState, update)
+
+    jobs = [run_health_checks(on_change=push_db_status)]
+    if schema_ready:
+        jobs += [
+            run_rollup_job(),
+            run_post_scheduler(),
+            run_change_feed(rx_app),
+            run_tombstone_sweep(),
+        ]
+    tasks = [asyncio.create_task(job) for job in jobs]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
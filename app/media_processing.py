@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import reflex as rx
+from PIL import Image, ImageOps
+from app.models import MediaAsset
+from app.storage import read_path_chunks, storage_backend, upload_file
+
+"""
+Post-upload media processing.
+
+While an upload streams to storage it is also spooled to a temporary file.
+A process pool then renders the derivatives from that copy:
+
+- thumbnail: 256x256 center crop, WebP (what the editor previews show)
+- web: at most 1280 px wide, re-encoded as WebP (stills only; animated
+  GIFs keep the original)
+- poster: a JPEG frame grabbed with ffmpeg, for videos
+
+Derivatives are stored next to the original as `<name>.<variant>.<ext>`.
+"""
+
+THUMBNAIL_SIZE = (256, 256)
+WEB_MAX_WIDTH = 1280
+PROCESS_WORKERS = int(os.environ.get("MEDIA_PROCESS_WORKERS", "2"))
+DERIVATIVE_CONTENT_TYPES = {".webp": "image/webp", ".jpg": "image/jpeg"}
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    return _process_pool
+
+
+def _extract_poster(source: Path, target: Path):
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-y",
+            "-ss",
+            "1",
+            "-i",
+            str(source),
+            "-frames:v",
+            "1",
+            "-vf",
+            f"scale='min({WEB_MAX_WIDTH},iw)':-2",
+            str(target),
+        ],
+        check=True,
+        timeout=60,
+    )
+
+
+def render_derivatives(source: str, content_type: str, out_dir: str) -> dict[str, str]:
+    source_path = Path(source)
+    out_path = Path(out_dir)
+    stem = source_path.stem
+    derivatives = {}
+    if content_type.startswith("video/"):
+        poster = out_path / f"{stem}.poster.jpg"
+        _extract_poster(source_path, poster)
+        derivatives["poster"] = str(poster)
+        still_source = poster
+    else:
+        still_source = source_path
+    with Image.open(still_source) as image:
+        animated = getattr(image, "is_animated", False)
+        image.seek(0)
+        frame = ImageOps.exif_transpose(image.convert("RGB"))
+        thumbnail = out_path / f"{stem}.thumb.webp"
+        ImageOps.fit(frame, THUMBNAIL_SIZE, Image.Resampling.LANCZOS).save(
+            thumbnail, "WEBP", quality=80, method=4
+        )
+        derivatives["thumbnail"] = str(thumbnail)
+        if not animated and not content_type.startswith("video/"):
+            web = out_path / f"{stem}.web.webp"
+            if frame.width > WEB_MAX_WIDTH:
+                frame = frame.resize(
+                    (WEB_MAX_WIDTH, round(frame.height * WEB_MAX_WIDTH / frame.width)),
+                    Image.Resampling.LANCZOS,
+                )
+            frame.save(web, "WEBP", quality=82, method=4)
+            derivatives["web"] = str(web)
+    return derivatives
+
+
+async def create_derivatives(
+    source: Path, stored_path: str, content_type: str
+) -> dict[str, str]:
+    loop = asyncio.get_running_loop()
+    local_files = await loop.run_in_executor(
+        _get_process_pool(),
+        render_derivatives,
+        str(source),
+        content_type,
+        str(source.parent),
+    )
+    directory = stored_path.rpartition("/")[0]
+    urls = {}
+    for variant, local_file in local_files.items():
+        local_path = Path(local_file)
+        target = f"{directory}/{local_path.name}" if directory else local_path.name
+        urls[variant] = await storage_backend.upload_stream(
+            target,
+            read_path_chunks(local_path),
+            DERIVATIVE_CONTENT_TYPES[local_path.suffix],
+            local_path.stat().st_size,
+        )
+    return urls
+
+
+async def upload_with_derivatives(file: rx.UploadFile, path: str) -> MediaAsset:
+    content_type = file.content_type or "application/octet-stream"
+    work_dir = Path(tempfile.mkdtemp(prefix="media-"))
+    try:
+        source = work_dir / Path(path).name
+        url = await upload_file(file, path, spool_to=source)
+        asset: MediaAsset = {
+            "url": url,
+            "content_type": content_type,
+            "thumbnail_url": url if content_type.startswith("image/") else "",
+            "web_url": url,
+            "poster_url": "",
+        }
+        if content_type.startswith(("image/", "video/")):
+            try:
+                derivatives = await create_derivatives(source, path, content_type)
+            except Exception as e:
+                logging.exception(f"Could not create derivatives for {path}: {e}")
+                derivatives = {}
+            asset["thumbnail_url"] = derivatives.get(
+                "thumbnail", asset["thumbnail_url"]
+            )
+            asset["web_url"] = derivatives.get("web", url)
+            asset["poster_url"] = derivatives.get("poster", "")
+        return asset
+    finally:
+        await asyncio.get_running_loop().run_in_executor(
+            None, shutil.rmtree, work_dir, True
+        )
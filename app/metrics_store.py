@@ -0,0 +1,104 @@
+import asyncio
+import datetime
+import logging
+import os
+from sqlalchemy import text
+from app.database import db_session
+
+"""
+Per-post engagement time series.
+
+`post_metrics` holds raw samples: each row is the likes, comments and
+impressions a post gained since its previous sample. Samples are written
+by the `posts_record_metric_sample` trigger (migration 0010) whenever a
+post's likes or comments change, and by `app.seed`. The rollup job folds
+samples into `post_metrics_daily` and `post_metrics_weekly`, both keyed by
+(post_id, bucket), so any trend window is a primary-key range read.
+
+The job re-aggregates every bucket touched since the last day boundary
+(ROLLUP_LOOKBACK_DAYS back) so late samples are picked up, and runs every
+METRICS_ROLLUP_INTERVAL seconds as an app lifespan task.
+"""
+
+ROLLUP_INTERVAL_SECONDS = float(os.environ.get("METRICS_ROLLUP_INTERVAL", "300"))
+ROLLUP_LOOKBACK_DAYS = 1
+
+
+def utc_today() -> datetime.date:
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+async def rollup_metrics(since: datetime.date):
+    week_start = since - datetime.timedelta(days=since.weekday())
+    async with db_session() as session:
+        await session.execute(
+            text("""
+                INSERT INTO post_metrics_daily (post_id, day, likes, comments, impressions)
+                SELECT post_id, (recorded_at AT TIME ZONE 'UTC')::date, sum(likes), sum(comments), sum(impressions)
+                FROM post_metrics
+                WHERE recorded_at >= :since_ts
+                GROUP BY 1, 2
+                ON CONFLICT (post_id, day) DO UPDATE SET
+                    likes = EXCLUDED.likes,
+                    comments = EXCLUDED.comments,
+                    impressions = EXCLUDED.impressions
+            """),
+            {
+                "since_ts": datetime.datetime.combine(
+                    since, datetime.time(), datetime.timezone.utc
+                )
+            },
+        )
+        await session.execute(
+            text("""
+                INSERT INTO post_metrics_weekly (post_id, week, likes, comments, impressions)
+                SELECT post_id, date_trunc('week', day)::date, sum(likes), sum(comments), sum(impressions)
+                FROM post_metrics_daily
+                WHERE day >= :week_start
+                GROUP BY 1, 2
+                ON CONFLICT (post_id, week) DO UPDATE SET
+                    likes = EXCLUDED.likes,
+                    comments = EXCLUDED.comments,
+                    impressions = EXCLUDED.impressions
+            """),
+            {"week_start": week_start},
+        )
+        await session.commit()
+
+
+async def run_rollup_job():
+    while True:
+        try:
+            since = utc_today() - datetime.timedelta(days=ROLLUP_LOOKBACK_DAYS)
+            await rollup_metrics(since)
+        except Exception as e:
+            logging.exception(f"Metrics rollup failed: {e}")
+        await asyncio.sleep(ROLLUP_INTERVAL_SECONDS)
+
+
+async def fetch_trend(
+    post_id: int, start: datetime.date, end: datetime.date, weekly: bool = False
+) -> list[tuple[datetime.date, int]]:
+    table, bucket = (
+        ("post_metrics_weekly", "week") if weekly else ("post_metrics_daily", "day")
+    )
+    if weekly:
+        start = start - datetime.timedelta(days=start.weekday())
+    async with db_session() as session:
+        result = await session.execute(
+            text(f"""
+                SELECT {bucket} AS bucket, likes + comments AS interactions
+                FROM {table}
+                WHERE post_id = :post_id AND {bucket} BETWEEN :start AND :end
+                ORDER BY {bucket}
+            """),
+            {"post_id": post_id, "start": start, "end": end},
+        )
+        by_bucket = {row.bucket: int(row.interactions) for row in result}
+    step = datetime.timedelta(days=7 if weekly else 1)
+    buckets = []
+    current = start
+    while current <= end:
+        buckets.append((current, by_bucket.get(current, 0)))
+        current += step
+    return buckets
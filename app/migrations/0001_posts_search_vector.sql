@@ -0,0 +1,19 @@
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector TSVECTOR NOT NULL DEFAULT ''::tsvector;
+
+CREATE OR REPLACE FUNCTION posts_search_vector_update() RETURNS trigger AS $$
+BEGIN
+	NEW.search_vector := to_tsvector('simple', NEW.content) || array_to_tsvector(
+		ARRAY(SELECT DISTINCT lower(m[1]) FROM regexp_matches(NEW.content, '(#[[:alnum:]]+)', 'g') AS m)
+	);
+	RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_search_vector_trigger ON posts;
+
+CREATE TRIGGER posts_search_vector_trigger BEFORE INSERT OR UPDATE OF content ON posts
+	FOR EACH ROW EXECUTE FUNCTION posts_search_vector_update();
+
+UPDATE posts SET content = content WHERE search_vector = ''::tsvector;
+
+CREATE INDEX IF NOT EXISTS posts_search_vector_idx ON posts USING GIN (search_vector);
@@ -0,0 +1 @@
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS media_derivatives JSONB DEFAULT '{}'::jsonb NOT NULL;
@@ -0,0 +1,31 @@
+CREATE TABLE IF NOT EXISTS post_metrics (
+	post_id BIGINT NOT NULL,
+	recorded_at TIMESTAMP WITH TIME ZONE NOT NULL,
+	likes INTEGER DEFAULT 0 NOT NULL,
+	comments INTEGER DEFAULT 0 NOT NULL,
+	impressions INTEGER DEFAULT 0 NOT NULL,
+	CONSTRAINT post_metrics_pkey PRIMARY KEY (post_id, recorded_at),
+	CONSTRAINT post_metrics_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS post_metrics_recorded_at_idx ON post_metrics (recorded_at);
+
+CREATE TABLE IF NOT EXISTS post_metrics_daily (
+	post_id BIGINT NOT NULL,
+	day DATE NOT NULL,
+	likes BIGINT DEFAULT 0 NOT NULL,
+	comments BIGINT DEFAULT 0 NOT NULL,
+	impressions BIGINT DEFAULT 0 NOT NULL,
+	CONSTRAINT post_metrics_daily_pkey PRIMARY KEY (post_id, day),
+	CONSTRAINT post_metrics_daily_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS post_metrics_weekly (
+	post_id BIGINT NOT NULL,
+	week DATE NOT NULL,
+	likes BIGINT DEFAULT 0 NOT NULL,
+	comments BIGINT DEFAULT 0 NOT NULL,
+	impressions BIGINT DEFAULT 0 NOT NULL,
+	CONSTRAINT post_metrics_weekly_pkey PRIMARY KEY (post_id, week),
+	CONSTRAINT post_metrics_weekly_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+);
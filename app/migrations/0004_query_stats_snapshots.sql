@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS query_stats_snapshots (
+	id SERIAL NOT NULL,
+	label TEXT NOT NULL,
+	taken_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+	stats JSONB NOT NULL,
+	CONSTRAINT query_stats_snapshots_pkey PRIMARY KEY (id)
+);
@@ -0,0 +1,18 @@
+-- Dashboard keyset pages: default date sort and engagement sort over all posts.
+CREATE INDEX IF NOT EXISTS posts_publication_date_id_idx ON posts (publication_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS posts_engagement_rate_id_idx ON posts (engagement_rate DESC, id DESC);
+
+-- Status filters ordered by date: management filters, analytics typeahead.
+-- Supersedes the published-only date index.
+CREATE INDEX IF NOT EXISTS posts_status_publication_date_idx ON posts (status, publication_date DESC, id DESC);
+DROP INDEX IF EXISTS posts_published_date_idx;
+
+-- Top-N rankings over published posts.
+CREATE INDEX IF NOT EXISTS posts_published_engagement_rate_idx ON posts (engagement_rate DESC, id DESC) WHERE status = 'Published';
+CREATE INDEX IF NOT EXISTS posts_published_likes_idx ON posts (likes DESC, id DESC) WHERE status = 'Published';
+CREATE INDEX IF NOT EXISTS posts_published_comments_idx ON posts (comments DESC, id DESC) WHERE status = 'Published';
+
+-- Scheduled posts that are due: status = 'Scheduled' AND publication_date <= now().
+CREATE INDEX IF NOT EXISTS posts_scheduled_due_idx ON posts (publication_date, id) WHERE status = 'Scheduled';
+
+ANALYZE posts;
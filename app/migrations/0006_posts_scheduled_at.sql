@@ -0,0 +1,8 @@
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMP WITH TIME ZONE;
+
+UPDATE posts SET scheduled_at = publication_date::timestamp AT TIME ZONE 'UTC'
+WHERE status = 'Scheduled' AND scheduled_at IS NULL;
+
+-- The publisher loads upcoming posts by exact publish time.
+CREATE INDEX IF NOT EXISTS posts_scheduled_at_idx ON posts (scheduled_at, id) WHERE status = 'Scheduled';
+DROP INDEX IF EXISTS posts_scheduled_due_idx;
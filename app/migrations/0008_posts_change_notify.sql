@@ -0,0 +1,35 @@
+CREATE OR REPLACE FUNCTION posts_notify_changes() RETURNS trigger AS $$
+DECLARE
+	changed_ids BIGINT[];
+	chunk_start INTEGER := 1;
+BEGIN
+	IF TG_OP = 'DELETE' THEN
+		SELECT array_agg(id) INTO changed_ids FROM old_rows;
+	ELSE
+		SELECT array_agg(id) INTO changed_ids FROM new_rows;
+	END IF;
+	WHILE changed_ids IS NOT NULL AND chunk_start <= array_length(changed_ids, 1) LOOP
+		PERFORM pg_notify(
+			'posts_changes',
+			json_build_object('op', lower(TG_OP), 'ids', changed_ids[chunk_start:chunk_start + 499])::text
+		);
+		chunk_start := chunk_start + 500;
+	END LOOP;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_notify_insert ON posts;
+CREATE TRIGGER posts_notify_insert AFTER INSERT ON posts
+	REFERENCING NEW TABLE AS new_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes();
+
+DROP TRIGGER IF EXISTS posts_notify_update ON posts;
+CREATE TRIGGER posts_notify_update AFTER UPDATE ON posts
+	REFERENCING NEW TABLE AS new_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes();
+
+DROP TRIGGER IF EXISTS posts_notify_delete ON posts;
+CREATE TRIGGER posts_notify_delete AFTER DELETE ON posts
+	REFERENCING OLD TABLE AS old_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes();
@@ -0,0 +1,37 @@
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL;
+
+CREATE OR REPLACE FUNCTION posts_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+	NEW.updated_at := now();
+	RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_touch_updated_at ON posts;
+CREATE TRIGGER posts_touch_updated_at BEFORE UPDATE ON posts
+	FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION posts_touch_updated_at();
+
+-- Incremental reloads read rows changed since a watermark.
+CREATE INDEX IF NOT EXISTS posts_updated_at_idx ON posts (updated_at);
+
+-- Deleted ids are kept so incremental reloads can drop them.
+CREATE TABLE IF NOT EXISTS post_tombstones (
+	post_id BIGINT PRIMARY KEY,
+	deleted_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS post_tombstones_deleted_at_idx ON post_tombstones (deleted_at);
+
+CREATE OR REPLACE FUNCTION posts_record_tombstones() RETURNS trigger AS $$
+BEGIN
+	INSERT INTO post_tombstones (post_id)
+	SELECT id FROM old_rows
+	ON CONFLICT (post_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_record_tombstones ON posts;
+CREATE TRIGGER posts_record_tombstones AFTER DELETE ON posts
+	REFERENCING OLD TABLE AS old_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_record_tombstones();
@@ -0,0 +1,17 @@
+-- Every change to a post's counters is recorded as a post_metrics sample
+-- of the delta, so trends follow real engagement whichever path wrote it.
+CREATE OR REPLACE FUNCTION posts_record_metric_sample() RETURNS trigger AS $$
+BEGIN
+	INSERT INTO post_metrics (post_id, recorded_at, likes, comments)
+	VALUES (NEW.id, clock_timestamp(), NEW.likes - OLD.likes, NEW.comments - OLD.comments)
+	ON CONFLICT (post_id, recorded_at) DO UPDATE SET
+		likes = post_metrics.likes + EXCLUDED.likes,
+		comments = post_metrics.comments + EXCLUDED.comments;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_record_metric_sample ON posts;
+CREATE TRIGGER posts_record_metric_sample AFTER UPDATE OF likes, comments ON posts
+	FOR EACH ROW WHEN (OLD.likes <> NEW.likes OR OLD.comments <> NEW.comments)
+	EXECUTE FUNCTION posts_record_metric_sample();
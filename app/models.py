@@ -6,9 +6,39 @@ class Post(TypedDict):
     id: int
     content: str
     publication_date: str
-    status: Literal["Published", "Draft", "Scheduled"]
+    status: Literal["Published", "Draft", "Scheduled", "Archived"]
     likes: int
     comments: int
     engagement_rate: float
     media_urls: list[str]
-    created_at: str
\ No newline at end of file
+    media_derivatives: dict[str, dict[str, str]]
+    created_at: str
+    updated_at: str
+
+
+class PostPreview(TypedDict):
+    id: int
+    content: str
+    publication_date: str
+    status: Literal["Published", "Draft", "Scheduled", "Archived"]
+    engagement_rate: float
+
+
+class PostStats(TypedDict):
+    total_posts: int
+    total_likes: int
+    total_comments: int
+    avg_engagement: float
+
+
+class PostOption(TypedDict):
+    id: str
+    label: str
+
+
+class MediaAsset(TypedDict):
+    url: str
+    content_type: str
+    thumbnail_url: str
+    web_url: str
+    poster_url: str
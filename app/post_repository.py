@@ -0,0 +1,535 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+from sqlalchemy import text
+from app.database import db_session
+from app.models import Post, PostOption, PostPreview, PostStats
+from app.search_index import PostSearchIndex, query_terms, to_tsquery
+
+"""
+Shared data access for the posts table.
+
+All states read posts through the process-wide `post_repository` so that a
+user clicking through the sidebar (and every other session on the worker)
+reuses one snapshot instead of re-running the same full-table query. Cached
+entries are tagged with the repository version; any write must call
+`post_repository.invalidate()` so the next read goes back to the database.
+
+Full snapshots carry a sync watermark so a state that already holds the
+table can reload with `fetch_changes_since` instead: rows whose trigger
+maintained `updated_at` is at or after the watermark, plus the ids recorded
+in `post_tombstones` by the delete trigger. `updated_at` is the writing
+transaction's start time, so the watermark is the start of the oldest
+transaction still open when it is taken (or now() if there is none);
+anything committed later is guaranteed to be at or after it. Catching up
+never invalidates the shared cache: writes on this worker invalidate it
+themselves and the change feed invalidates it once per notification batch,
+so one write does not cost every open session a cold cache. Reads that
+must not predate a watermark just taken pass `fresh=True` to skip cached
+and in-flight results. Tombstones are swept after TOMBSTONE_RETENTION
+seconds (plus one sweep interval of grace), so a watermark older than the
+retention window is no longer trusted and the state reloads in full.
+"""
+
+POST_COLUMNS = "id, content, publication_date, status, likes, comments, engagement_rate, media_urls, media_derivatives, created_at, updated_at"
+
+PREVIEW_COLUMNS = "id, left(content, :preview_length) AS content, publication_date, status, engagement_rate"
+
+DASHBOARD_PREVIEW_LENGTH = 50
+MANAGEMENT_PREVIEW_LENGTH = 150
+
+SORT_EXPRESSIONS = {
+    "content": "posts.content",
+    "publication_date": "publication_date",
+    "status": "status::text",
+    "engagement_rate": "engagement_rate",
+}
+
+SEARCH_RESULT_LIMIT = 500
+
+TOP_METRICS = ("engagement_rate", "likes", "comments")
+
+SUGGESTION_LIMIT = 8
+SUGGESTION_LABEL_LENGTH = 80
+
+TOMBSTONE_RETENTION_SECONDS = float(os.environ.get("TOMBSTONE_RETENTION", "86400"))
+TOMBSTONE_SWEEP_SECONDS = float(os.environ.get("TOMBSTONE_SWEEP_INTERVAL", "3600"))
+
+WATERMARK_SQL = """
+    SELECT least(now(), min(xact_start)) FROM pg_stat_activity
+    WHERE datname = current_database() AND xact_start IS NOT NULL
+"""
+
+
+def row_to_post(row) -> Post:
+    post_dict = dict(row)
+    post_dict["publication_date"] = row.publication_date.isoformat()
+    if post_dict.get("media_urls") is None:
+        post_dict["media_urls"] = []
+    if post_dict.get("media_derivatives") is None:
+        post_dict["media_derivatives"] = {}
+    return post_dict
+
+
+def row_to_preview(row) -> PostPreview:
+    return {
+        "id": row.id,
+        "content": row.content,
+        "publication_date": row.publication_date.isoformat(),
+        "status": row.status,
+        "engagement_rate": row.engagement_rate,
+    }
+
+
+def to_preview(post: Post, preview_length: int) -> PostPreview:
+    return {
+        "id": post["id"],
+        "content": post["content"][:preview_length],
+        "publication_date": post["publication_date"],
+        "status": post["status"],
+        "engagement_rate": post["engagement_rate"],
+    }
+
+
+def watermark_is_current(watermark: datetime.datetime | None) -> bool:
+    if watermark is None:
+        return False
+    age = datetime.datetime.now(datetime.timezone.utc) - watermark
+    return age.total_seconds() < TOMBSTONE_RETENTION_SECONDS
+
+
+def index_posts(posts: list[Post]) -> dict[int, Post]:
+    return {p["id"]: p for p in posts}
+
+
+def top_posts_in_memory(
+    posts: list[Post],
+    metric: str,
+    n: int,
+    start: str | None = None,
+    end: str | None = None,
+) -> list[Post]:
+    return heapq.nlargest(
+        n,
+        (
+            p
+            for p in posts
+            if p["status"] == "Published"
+            and (start is None or p["publication_date"] >= start)
+            and (end is None or p["publication_date"] <= end)
+        ),
+        key=lambda p: (p[metric], p["id"]),
+    )
+
+
+class PostRepository:
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: OrderedDict[tuple, tuple[int, float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+        self._search_index: PostSearchIndex | None = None
+        self._search_index_version = -1
+        self._post_index: dict[int, Post] = {}
+        self._post_index_source: list[Post] | None = None
+
+    def invalidate(self):
+        self.version += 1
+        self._entries.clear()
+
+    def _peek(self, key: tuple) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, loaded_at, value = entry
+        if version != self.version or time.monotonic() - loaded_at >= self.ttl_seconds:
+            return None
+        return value
+
+    async def _cached(
+        self, key: tuple, loader: Callable[[], Awaitable[Any]], fresh: bool = False
+    ) -> Any:
+        entry = None if fresh else self._entries.get(key)
+        if entry is not None:
+            version, loaded_at, value = entry
+            if (
+                version == self.version
+                and time.monotonic() - loaded_at < self.ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+        version = self.version
+        flight_key = (version, key)
+        task = None if fresh else self._in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(
+                lambda done: self._in_flight.pop(flight_key)
+                if self._in_flight.get(flight_key) is done
+                else None
+            )
+        value = await asyncio.shield(task)
+        if version == self.version:
+            self._entries[key] = (version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    async def fetch_posts(self, status: str | None = None) -> list[Post]:
+        posts, _ = await self._cached(("posts",), self._query_posts)
+        return [
+            dict(p) for p in posts if status is None or p["status"] == status
+        ]
+
+    def cached_posts(self, status: str | None = None) -> list[Post]:
+        snapshot = self._peek(("posts",))
+        if snapshot is None:
+            return []
+        posts, _ = snapshot
+        return [
+            dict(p) for p in posts if status is None or p["status"] == status
+        ]
+
+    async def fetch_snapshot(self) -> tuple[list[Post], datetime.datetime]:
+        posts, watermark = await self._cached(("posts",), self._query_posts)
+        return [dict(p) for p in posts], watermark
+
+    async def _query_posts(self) -> tuple[list[Post], datetime.datetime]:
+        async with db_session() as session:
+            watermark = (await session.execute(text(WATERMARK_SQL))).scalar_one()
+            result = await session.execute(
+                text(
+                    f"SELECT {POST_COLUMNS} FROM posts ORDER BY publication_date DESC"
+                )
+            )
+            return [row_to_post(p) for p in result.mappings().all()], watermark
+
+    async def fetch_watermark(self) -> datetime.datetime:
+        async with db_session() as session:
+            return (await session.execute(text(WATERMARK_SQL))).scalar_one()
+
+    async def fetch_changes_since(
+        self, watermark: datetime.datetime
+    ) -> tuple[list[Post], list[int], datetime.datetime]:
+        async with db_session() as session:
+            next_watermark = (await session.execute(text(WATERMARK_SQL))).scalar_one()
+            result = await session.execute(
+                text(f"SELECT {POST_COLUMNS} FROM posts WHERE updated_at >= :since"),
+                {"since": watermark},
+            )
+            posts = [row_to_post(p) for p in result.mappings().all()]
+            result = await session.execute(
+                text("SELECT post_id FROM post_tombstones WHERE deleted_at >= :since"),
+                {"since": watermark},
+            )
+            deleted_ids = list(result.scalars().all())
+        return posts, deleted_ids, next_watermark
+
+    async def fetch_page(
+        self,
+        sort_by: str,
+        ascending: bool,
+        limit: int,
+        cursor: tuple | None = None,
+        offset: int = 0,
+        preview_length: int = DASHBOARD_PREVIEW_LENGTH,
+        status: str | None = None,
+        fresh: bool = False,
+    ) -> tuple[list[PostPreview], tuple | None]:
+        key = ("page", sort_by, ascending, limit, cursor, offset, preview_length, status)
+        posts, next_cursor = await self._cached(
+            key,
+            lambda: self._query_page(
+                sort_by, ascending, limit, cursor, offset, preview_length, status
+            ),
+            fresh=fresh,
+        )
+        return [dict(p) for p in posts], next_cursor
+
+    async def _query_page(
+        self,
+        sort_by: str,
+        ascending: bool,
+        limit: int,
+        cursor: tuple | None,
+        offset: int,
+        preview_length: int,
+        status: str | None = None,
+    ) -> tuple[list[PostPreview], tuple | None]:
+        sort_expression = SORT_EXPRESSIONS.get(sort_by, "publication_date")
+        direction = "ASC" if ascending else "DESC"
+        comparison = ">" if ascending else "<"
+        params: dict[str, Any] = {"limit": limit, "preview_length": preview_length}
+        conditions, where_clause, offset_clause = [], "", ""
+        if status is not None:
+            conditions.append("status = CAST(:status AS post_status)")
+            params["status"] = status
+        if cursor is not None:
+            conditions.append(
+                f"({sort_expression}, id) {comparison} (:cursor_value, :cursor_id)"
+            )
+            params["cursor_value"], params["cursor_id"] = cursor
+        elif offset:
+            offset_clause = "OFFSET :offset"
+            params["offset"] = offset
+        if conditions:
+            where_clause = f"WHERE {' AND '.join(conditions)}"
+        async with db_session() as session:
+            result = await session.execute(
+                text(
+                    f"SELECT {PREVIEW_COLUMNS}, {sort_expression} AS sort_key FROM posts {where_clause} ORDER BY {sort_expression} {direction}, id {direction} LIMIT :limit {offset_clause}"
+                ),
+                params,
+            )
+            rows = result.all()
+        posts = [row_to_preview(p) for p in rows]
+        next_cursor = (rows[-1].sort_key, rows[-1].id) if rows else None
+        return posts, next_cursor
+
+    async def search_post_ids(
+        self,
+        query: str,
+        status: str | None = None,
+        limit: int = SEARCH_RESULT_LIMIT,
+        fresh: bool = False,
+    ) -> list[int]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        tsquery = to_tsquery(terms)
+        return list(
+            await self._cached(
+                ("search", tsquery, status, limit),
+                lambda: self._query_search(tsquery, status, limit),
+                fresh=fresh,
+            )
+        )
+
+    async def _query_search(
+        self, tsquery: str, status: str | None, limit: int
+    ) -> list[int]:
+        status_clause = ""
+        params: dict[str, Any] = {"tsquery": tsquery, "limit": limit}
+        if status is not None:
+            status_clause = "AND status = CAST(:status AS post_status)"
+            params["status"] = status
+        async with db_session() as session:
+            result = await session.execute(
+                text(f"""
+                    SELECT id FROM posts, CAST(:tsquery AS tsquery) AS query
+                    WHERE search_vector @@ query {status_clause}
+                    ORDER BY ts_rank(search_vector, query) DESC, publication_date DESC
+                    LIMIT :limit
+                """),
+                params,
+            )
+            return list(result.scalars().all())
+
+    async def suggest_posts(
+        self,
+        query: str,
+        status: str = "Published",
+        limit: int = SUGGESTION_LIMIT,
+        fresh: bool = False,
+    ) -> list[PostOption]:
+        terms = query_terms(query)
+        tsquery = to_tsquery(terms) if terms else ""
+        options = await self._cached(
+            ("suggest", tsquery, status, limit),
+            lambda: self._query_suggestions(tsquery, status, limit),
+            fresh=fresh,
+        )
+        return [dict(o) for o in options]
+
+    async def _query_suggestions(
+        self, tsquery: str, status: str, limit: int
+    ) -> list[PostOption]:
+        params: dict[str, Any] = {
+            "status": status,
+            "limit": limit,
+            "label_length": SUGGESTION_LABEL_LENGTH,
+        }
+        if tsquery:
+            query_sql = """
+                SELECT id, left(content, :label_length) AS label
+                FROM posts, CAST(:tsquery AS tsquery) AS query
+                WHERE search_vector @@ query AND status = :status
+                ORDER BY ts_rank(search_vector, query) DESC, publication_date DESC
+                LIMIT :limit
+            """
+            params["tsquery"] = tsquery
+        else:
+            query_sql = """
+                SELECT id, left(content, :label_length) AS label
+                FROM posts
+                WHERE status = :status
+                ORDER BY publication_date DESC, id DESC
+                LIMIT :limit
+            """
+        async with db_session() as session:
+            result = await session.execute(text(query_sql), params)
+            return [
+                {"id": str(row.id), "label": row.label} for row in result.all()
+            ]
+
+    def _snapshot_post(self, post_id: int) -> Post | None:
+        snapshot = self._peek(("posts",))
+        if snapshot is None:
+            return None
+        posts, _ = snapshot
+        if self._post_index_source is not posts:
+            self._post_index = index_posts(posts)
+            self._post_index_source = posts
+        return self._post_index.get(post_id)
+
+    async def fetch_post(self, post_id: int, fresh: bool = False) -> Post | None:
+        post = None if fresh else self._snapshot_post(post_id)
+        if post is None:
+            post = await self._cached(
+                ("post", post_id), lambda: self._query_post(post_id), fresh=fresh
+            )
+        return dict(post) if post is not None else None
+
+    async def _query_post(self, post_id: int) -> Post | None:
+        async with db_session() as session:
+            result = await session.execute(
+                text(f"SELECT {POST_COLUMNS} FROM posts WHERE id = :id"),
+                {"id": post_id},
+            )
+            row = result.mappings().one_or_none()
+        return row_to_post(row) if row is not None else None
+
+    async def fetch_previews_by_ids(
+        self, post_ids: list[int], preview_length: int
+    ) -> list[PostPreview]:
+        if not post_ids:
+            return []
+        async with db_session() as session:
+            result = await session.execute(
+                text(
+                    f"SELECT {PREVIEW_COLUMNS} FROM posts WHERE id = ANY(CAST(:ids AS bigint[]))"
+                ),
+                {"ids": post_ids, "preview_length": preview_length},
+            )
+            previews = {row.id: row_to_preview(row) for row in result.all()}
+        return [previews[post_id] for post_id in post_ids if post_id in previews]
+
+    async def fetch_posts_by_ids(self, post_ids: list[int]) -> list[Post]:
+        if not post_ids:
+            return []
+        async with db_session() as session:
+            result = await session.execute(
+                text(
+                    f"SELECT {POST_COLUMNS} FROM posts WHERE id = ANY(CAST(:ids AS bigint[]))"
+                ),
+                {"ids": post_ids},
+            )
+            return [row_to_post(p) for p in result.mappings().all()]
+
+    def local_search_index(self, posts: list[Post]) -> PostSearchIndex:
+        if self._search_index is None or self._search_index_version != self.version:
+            self._search_index = PostSearchIndex.from_posts(posts)
+            self._search_index_version = self.version
+        return self._search_index
+
+    async def fetch_top_posts(
+        self,
+        metric: str = "engagement_rate",
+        n: int = 3,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        fresh: bool = False,
+    ) -> list[Post]:
+        if metric not in TOP_METRICS:
+            raise ValueError(f"Unsupported top-N metric: {metric}")
+        posts = await self._cached(
+            ("top", metric, n, start, end),
+            lambda: self._query_top_posts(metric, n, start, end),
+            fresh=fresh,
+        )
+        return [dict(p) for p in posts]
+
+    async def _query_top_posts(
+        self,
+        metric: str,
+        n: int,
+        start: datetime.date | None,
+        end: datetime.date | None,
+    ) -> list[Post]:
+        conditions = ["status = 'Published'"]
+        params: dict[str, Any] = {"n": n}
+        if start is not None:
+            conditions.append("publication_date >= :start")
+            params["start"] = start
+        if end is not None:
+            conditions.append("publication_date <= :end")
+            params["end"] = end
+        async with db_session() as session:
+            result = await session.execute(
+                text(f"""
+                    SELECT {POST_COLUMNS} FROM posts
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY {metric} DESC, id DESC
+                    LIMIT :n
+                """),
+                params,
+            )
+            return [row_to_post(p) for p in result.mappings().all()]
+
+    async def fetch_stats(self, fresh: bool = False) -> PostStats:
+        return dict(await self._cached(("stats",), self._query_stats, fresh=fresh))
+
+    async def _query_stats(self) -> PostStats:
+        async with db_session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT
+                        count(*) AS total_posts,
+                        coalesce(sum(likes) FILTER (WHERE status = 'Published'), 0) AS total_likes,
+                        coalesce(sum(comments) FILTER (WHERE status = 'Published'), 0) AS total_comments,
+                        coalesce(round(avg(engagement_rate) FILTER (WHERE status = 'Published')::numeric, 2), 0) AS avg_engagement
+                    FROM posts
+                """)
+            )
+            row = result.mappings().one()
+        return {
+            "total_posts": int(row["total_posts"]),
+            "total_likes": int(row["total_likes"]),
+            "total_comments": int(row["total_comments"]),
+            "avg_engagement": float(row["avg_engagement"]),
+        }
+
+
+post_repository = PostRepository()
+
+
+async def prune_tombstones() -> int:
+    async with db_session() as session:
+        result = await session.execute(
+            text(
+                "DELETE FROM post_tombstones WHERE deleted_at < now() - make_interval(secs => :seconds)"
+            ),
+            {"seconds": TOMBSTONE_RETENTION_SECONDS + TOMBSTONE_SWEEP_SECONDS},
+        )
+        await session.commit()
+        return result.rowcount
+
+
+async def run_tombstone_sweep():
+    while True:
+        try:
+            pruned = await prune_tombstones()
+            if pruned:
+                logging.info(f"Pruned {pruned} post tombstone(s)")
+        except Exception as e:
+            logging.exception(f"Tombstone sweep failed: {e}")
+        await asyncio.sleep(TOMBSTONE_SWEEP_SECONDS)
@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import os
+import time
+from sqlalchemy import text
+from app.database import db_session
+from app.post_repository import post_repository
+
+"""
+Background publisher for scheduled posts.
+
+Upcoming publish times are kept in an in-memory min-heap of
+(scheduled_at, post_id). The first refill loads everything due within
+SCHEDULER_HORIZON seconds from the partial `posts_scheduled_at_idx` index;
+every SCHEDULER_REFILL seconds after that only the slice of time the
+horizon has moved forward by is read, plus any post that is already
+overdue. The overdue part picks up posts whose publish failed or whose row
+was locked by another worker, since they have left the heap. Posts scheduled or rescheduled
+inside the loaded window reach the heap through `schedule()` on the worker
+that made the change and through `refresh()` from the change feed on the
+others; the feed calls `reset()` after (re)connecting so notifications
+missed while disconnected are covered by one full refill. The loop sleeps
+until the earliest entry is due (or a new earlier entry arrives), so
+publishing is sub-second accurate without polling the table.
+
+Due posts are claimed and published in batches with one UPDATE ... WHERE
+id = ANY(...) over rows locked FOR UPDATE SKIP LOCKED, so several workers
+running the same scheduler never publish a post twice. Stale heap entries
+(rescheduled or deleted posts) are harmless: the claim re-checks status and
+scheduled_at in the database.
+"""
+
+HORIZON_SECONDS = float(os.environ.get("SCHEDULER_HORIZON", "3600"))
+REFILL_SECONDS = float(os.environ.get("SCHEDULER_REFILL", "30"))
+BATCH_SIZE = int(os.environ.get("SCHEDULER_BATCH_SIZE", "500"))
+MAX_QUEUED = int(os.environ.get("SCHEDULER_MAX_QUEUED", "100000"))
+
+
+class PostScheduler:
+    def __init__(self):
+        self._heap: list[tuple[float, int]] = []
+        self._queued: dict[int, float] = {}
+        self._wake = asyncio.Event()
+        self._next_refill = 0.0
+        self._horizon: datetime.datetime | None = None
+        self.published = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, post_id: int, scheduled_at: datetime.datetime):
+        due_at = scheduled_at.timestamp()
+        if self._queued.get(post_id) == due_at:
+            return
+        if due_at > time.time() + HORIZON_SECONDS:
+            return
+        self._queued[post_id] = due_at
+        heapq.heappush(self._heap, (due_at, post_id))
+        if self._heap[0] == (due_at, post_id):
+            self._wake.set()
+
+    def reset(self):
+        self._horizon = None
+        self._next_refill = 0.0
+        self._wake.set()
+
+    async def refill(self):
+        horizon = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=HORIZON_SECONDS
+        )
+        window = "scheduled_at <= :horizon"
+        params = {"horizon": horizon, "limit": MAX_QUEUED}
+        if self._horizon is not None:
+            window = "(scheduled_at <= now() OR (scheduled_at > :previous AND scheduled_at <= :horizon))"
+            params["previous"] = self._horizon
+        async with db_session() as session:
+            result = await session.execute(
+                text(f"""
+                    SELECT id, scheduled_at FROM posts
+                    WHERE status = 'Scheduled' AND {window}
+                    ORDER BY scheduled_at, id
+                    LIMIT :limit
+                """),
+                params,
+            )
+            rows = result.all()
+        for row in rows:
+            self.schedule(row.id, row.scheduled_at)
+        if len(rows) == MAX_QUEUED:
+            horizon = rows[-1].scheduled_at - datetime.timedelta(microseconds=1)
+        self._horizon = horizon
+        self._next_refill = time.monotonic() + REFILL_SECONDS
+
+    async def refresh(self, post_ids: list[int]):
+        if not post_ids or self._horizon is None:
+            return
+        async with db_session() as session:
+            result = await session.execute(
+                text("""
+                    SELECT id, scheduled_at FROM posts
+                    WHERE id = ANY(CAST(:ids AS bigint[]))
+                        AND status = 'Scheduled'
+                        AND scheduled_at <= :horizon
+                """),
+                {"ids": post_ids, "horizon": self._horizon},
+            )
+            rows = result.all()
+        for row in rows:
+            self.schedule(row.id, row.scheduled_at)
+
+    def _pop_due(self) -> list[int]:
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < BATCH_SIZE:
+            due_at, post_id = heapq.heappop(self._heap)
+            if self._queued.get(post_id) == due_at:
+                del self._queued[post_id]
+                due.append(post_id)
+        return due
+
+    async def publish(self, post_ids: list[int]) -> list[int]:
+        async with db_session() as session:
+            result = await session.execute(
+                text("""
+                    UPDATE posts
+                    SET status = 'Published', publication_date = current_date
+                    WHERE id = ANY(ARRAY(
+                        SELECT id FROM posts
+                        WHERE id = ANY(CAST(:ids AS bigint[]))
+                            AND status = 'Scheduled'
+                            AND scheduled_at <= now()
+                        FOR UPDATE SKIP LOCKED
+                    ))
+                    RETURNING id
+                """),
+                {"ids": post_ids},
+            )
+            published = list(result.scalars().all())
+            await session.commit()
+        if published:
+            self.published += len(published)
+            post_repository.invalidate()
+            logging.info(f"Published {len(published)} scheduled post(s)")
+        return published
+
+    def _seconds_until_next(self) -> float:
+        until_refill = max(self._next_refill - time.monotonic(), 0.0)
+        if not self._heap:
+            return until_refill
+        return min(max(self._heap[0][0] - time.time(), 0.0), until_refill)
+
+    async def run(self):
+        while True:
+            try:
+                if time.monotonic() >= self._next_refill:
+                    await self.refill()
+                due = self._pop_due()
+                if due:
+                    await self.publish(due)
+                    continue
+            except Exception as e:
+                logging.exception(f"Post scheduler failed: {e}")
+                self._next_refill = time.monotonic() + REFILL_SECONDS
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), timeout=self._seconds_until_next()
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+post_scheduler = PostScheduler()
+
+
+async def run_post_scheduler():
+    await post_scheduler.run()
@@ -0,0 +1,188 @@
+import json
+from typing import Any, TypedDict
+from sqlalchemy import text
+from app.database import db_session
+
+"""
+Query profiling on top of pg_stat_statements.
+
+Reads the statement statistics for the app's own database, ranks them, and
+stores named snapshots in `query_stats_snapshots` so the numbers before and
+after a deploy (or before and after a change to a fetch path) can be
+diffed. Against a local Postgres the extension has to be preloaded:
+
+    postgres -c shared_preload_libraries=pg_stat_statements
+    CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
+"""
+
+RANKINGS = {
+    "total_exec_time": "total_exec_time DESC",
+    "mean_exec_time": "mean_exec_time DESC",
+    "calls": "calls DESC",
+    "rows": "rows DESC",
+    "cache_hit_ratio": "cache_hit_ratio ASC NULLS LAST",
+}
+
+QUERY_STATS_LIMIT = 25
+
+STATEMENTS_SQL = """
+    SELECT
+        queryid::text AS queryid,
+        query,
+        calls,
+        total_exec_time,
+        mean_exec_time,
+        rows,
+        shared_blks_hit,
+        shared_blks_read,
+        shared_blks_hit::float / nullif(shared_blks_hit + shared_blks_read, 0) AS cache_hit_ratio
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+        AND query NOT ILIKE '%pg_stat_statements%'
+        AND query NOT ILIKE '%query_stats_snapshots%'
+"""
+
+
+class QueryStat(TypedDict):
+    queryid: str
+    query: str
+    calls: int
+    total_exec_ms: float
+    mean_exec_ms: float
+    rows: int
+    cache_hit_pct: float
+
+
+class QuerySnapshot(TypedDict):
+    id: int
+    label: str
+    taken_at: str
+    statements: int
+
+
+def _to_stat(row) -> QueryStat:
+    return {
+        "queryid": row["queryid"],
+        "query": row["query"],
+        "calls": int(row["calls"]),
+        "total_exec_ms": round(float(row["total_exec_time"]), 2),
+        "mean_exec_ms": round(float(row["mean_exec_time"]), 3),
+        "rows": int(row["rows"]),
+        "cache_hit_pct": round(float(row["cache_hit_ratio"]) * 100, 2)
+        if row["cache_hit_ratio"] is not None
+        else 100.0,
+    }
+
+
+async def fetch_query_stats(
+    rank_by: str = "total_exec_time", limit: int = QUERY_STATS_LIMIT
+) -> list[QueryStat]:
+    if rank_by not in RANKINGS:
+        raise ValueError(f"Unsupported ranking: {rank_by}")
+    async with db_session() as session:
+        result = await session.execute(
+            text(f"{STATEMENTS_SQL} ORDER BY {RANKINGS[rank_by]} LIMIT :limit"),
+            {"limit": limit},
+        )
+        return [_to_stat(row) for row in result.mappings().all()]
+
+
+async def take_snapshot(label: str) -> int:
+    async with db_session() as session:
+        result = await session.execute(
+            text(f"""
+                INSERT INTO query_stats_snapshots (label, stats)
+                SELECT :label, coalesce(jsonb_agg(to_jsonb(s)), '[]'::jsonb)
+                FROM ({STATEMENTS_SQL}) AS s
+                RETURNING id
+            """),
+            {"label": label},
+        )
+        snapshot_id = result.scalar_one()
+        await session.commit()
+        return snapshot_id
+
+
+async def list_snapshots() -> list[QuerySnapshot]:
+    async with db_session() as session:
+        result = await session.execute(
+            text("""
+                SELECT id, label, taken_at, jsonb_array_length(stats) AS statements
+                FROM query_stats_snapshots
+                ORDER BY taken_at DESC
+            """)
+        )
+        return [
+            {
+                "id": row.id,
+                "label": row.label,
+                "taken_at": row.taken_at.isoformat(timespec="seconds"),
+                "statements": row.statements,
+            }
+            for row in result.all()
+        ]
+
+
+async def _load_snapshot(session, snapshot_id: int) -> list[dict[str, Any]]:
+    result = await session.execute(
+        text("SELECT stats FROM query_stats_snapshots WHERE id = :id"),
+        {"id": snapshot_id},
+    )
+    stats = result.scalar_one()
+    return json.loads(stats) if isinstance(stats, str) else stats
+
+
+def diff_stats(
+    before: list[dict[str, Any]], after: list[dict[str, Any]]
+) -> list[QueryStat]:
+    before_by_id = {row["queryid"]: row for row in before}
+    diffs = []
+    for row in after:
+        previous = before_by_id.get(row["queryid"])
+        if previous is None:
+            previous = {
+                "calls": 0,
+                "total_exec_time": 0.0,
+                "rows": 0,
+                "shared_blks_hit": 0,
+                "shared_blks_read": 0,
+            }
+        calls = row["calls"] - previous["calls"]
+        if calls <= 0:
+            continue
+        total_exec_time = row["total_exec_time"] - previous["total_exec_time"]
+        hits = row["shared_blks_hit"] - previous["shared_blks_hit"]
+        reads = row["shared_blks_read"] - previous["shared_blks_read"]
+        diffs.append(
+            _to_stat(
+                {
+                    "queryid": row["queryid"],
+                    "query": row["query"],
+                    "calls": calls,
+                    "total_exec_time": total_exec_time,
+                    "mean_exec_time": total_exec_time / calls,
+                    "rows": row["rows"] - previous["rows"],
+                    "cache_hit_ratio": hits / (hits + reads) if hits + reads else None,
+                }
+            )
+        )
+    return sorted(diffs, key=lambda s: s["total_exec_ms"], reverse=True)
+
+
+async def diff_snapshot(
+    snapshot_id: int, against_id: int | None = None
+) -> list[QueryStat]:
+    async with db_session() as session:
+        before = await _load_snapshot(session, snapshot_id)
+        if against_id is not None:
+            after = await _load_snapshot(session, against_id)
+        else:
+            result = await session.execute(text(STATEMENTS_SQL))
+            after = [dict(row) for row in result.mappings().all()]
+    return diff_stats(before, after)
+
+
+async def reset_query_stats():
+    async with db_session() as session:
+        await session.execute(text("SELECT pg_stat_statements_reset()"))
+        await session.commit()
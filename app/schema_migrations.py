@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+from sqlalchemy import text
+from app.database import check_health, db_session, health, uses_postgres
+from app.post_repository import POST_COLUMNS, SEARCH_RESULT_LIMIT
+
+"""
+Versioned schema migrations, applied at app startup.
+
+Each file in app/migrations is applied once, in file-name order, inside its
+own transaction, and recorded in `schema_migrations` with a checksum so an
+edited migration is reported instead of silently skipped. A transaction
+level advisory lock serialises workers that start at the same time.
+Migrations are written to be idempotent so databases created from
+schema.sql before this runner existed converge to the same state. They run
+without the pool's statement timeout, and the app does not start serving
+until they have all been applied; a failed migration aborts startup. When
+the database is not Postgres or cannot be reached, migrations are skipped
+with a warning and the app starts in its offline mode.
+
+`verify_index_usage` runs EXPLAIN ANALYZE on the hot post queries and fails
+if any of them falls back to a sequential scan of posts. Run it against a
+seeded database:
+
+    python -m app.seed --count 100000
+    python -m app.schema_migrations --verify-indexes
+"""
+
+MIGRATIONS_DIR = Path(__file__).with_name("migrations")
+MIGRATION_LOCK_ID = 7_405_112_021
+SYNC_WATERMARK = datetime.datetime.now(datetime.timezone.utc)
+
+HOT_QUERIES: dict[str, tuple[str, dict[str, Any]]] = {
+    "dashboard.page_by_date": (
+        "SELECT id FROM posts ORDER BY publication_date DESC, id DESC LIMIT 5",
+        {},
+    ),
+    "dashboard.page_by_engagement": (
+        "SELECT id FROM posts ORDER BY engagement_rate DESC, id DESC LIMIT 5",
+        {},
+    ),
+    "management.page_by_status": (
+        "SELECT id FROM posts WHERE status = 'Draft' ORDER BY publication_date DESC, id DESC LIMIT 24",
+        {},
+    ),
+    "management.search_by_status": (
+        "SELECT id FROM posts, CAST(:tsquery AS tsquery) AS query WHERE search_vector @@ query AND status = CAST(:status AS post_status) ORDER BY ts_rank(search_vector, query) DESC, publication_date DESC LIMIT :limit",
+        {"tsquery": "'leadership':*", "status": "Draft", "limit": SEARCH_RESULT_LIMIT},
+    ),
+    "analytics.suggestions": (
+        "SELECT id FROM posts WHERE status = 'Published' ORDER BY publication_date DESC, id DESC LIMIT 8",
+        {},
+    ),
+    "analytics.top_posts": (
+        "SELECT id FROM posts WHERE status = 'Published' ORDER BY engagement_rate DESC, id DESC LIMIT 3",
+        {},
+    ),
+    "scheduler.due_posts": (
+        "SELECT id, scheduled_at FROM posts WHERE status = 'Scheduled' AND scheduled_at <= now() + interval '1 hour' ORDER BY scheduled_at, id LIMIT 1000",
+        {},
+    ),
+    "search.prefix": (
+        "SELECT id FROM posts WHERE search_vector @@ CAST(:tsquery AS tsquery) LIMIT 50",
+        {"tsquery": "'leadership':*"},
+    ),
+    "post.by_id": ("SELECT id FROM posts WHERE id = :id", {"id": 1}),
+    "sync.changed_since": (
+        f"SELECT {POST_COLUMNS} FROM posts WHERE updated_at >= :since",
+        {"since": SYNC_WATERMARK},
+    ),
+}
+
+
+def migration_files() -> list[Path]:
+    return sorted(MIGRATIONS_DIR.glob("*.sql"))
+
+
+def checksum(sql: str) -> str:
+    return hashlib.sha256(sql.encode()).hexdigest()
+
+
+async def apply_migrations() -> list[str]:
+    applied = []
+    async with db_session() as session:
+        await session.execute(
+            text("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version TEXT PRIMARY KEY,
+                    checksum TEXT NOT NULL,
+                    applied_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+                )
+            """)
+        )
+        await session.commit()
+        for path in migration_files():
+            version = path.stem
+            sql = path.read_text()
+            await session.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                {"lock_id": MIGRATION_LOCK_ID},
+            )
+            result = await session.execute(
+                text("SELECT checksum FROM schema_migrations WHERE version = :version"),
+                {"version": version},
+            )
+            recorded = result.scalar_one_or_none()
+            if recorded is not None:
+                if recorded != checksum(sql):
+                    logging.warning(f"Migration {version} changed after it was applied")
+                await session.rollback()
+                continue
+            await session.execute(text("SET LOCAL statement_timeout = 0"))
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.execute(sql)
+            await session.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, checksum) VALUES (:version, :checksum)"
+                ),
+                {"version": version, "checksum": checksum(sql)},
+            )
+            await session.commit()
+            applied.append(version)
+            logging.info(f"Applied migration {version}")
+    return applied
+
+
+async def run_migrations() -> bool:
+    if not uses_postgres():
+        logging.warning("Schema migrations skipped: the database is not Postgres")
+        return False
+    if not await check_health():
+        logging.warning(
+            f"Schema migrations skipped: the database is unreachable ({health.last_error})"
+        )
+        return False
+    try:
+        await apply_migrations()
+    except Exception as e:
+        logging.exception(f"Schema migrations failed: {e}")
+        raise
+    return True
+
+
+def _plan_nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+async def verify_index_usage() -> dict[str, list[str]]:
+    failures = {}
+    async with db_session() as session:
+        await session.execute(text("ANALYZE posts"))
+        for name, (query, params) in HOT_QUERIES.items():
+            result = await session.execute(
+                text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"), params
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = [
+                node
+                for node in _plan_nodes(plan[0]["Plan"])
+                if node.get("Relation Name") == "posts"
+            ]
+            scans = [
+                f"{node['Node Type']} using {node.get('Index Name', '-')}"
+                for node in nodes
+            ]
+            if not nodes or any(node["Node Type"] == "Seq Scan" for node in nodes):
+                failures[name] = scans
+            print(f"{name:<32} {'FAIL' if name in failures else 'ok':<5} {', '.join(scans)}")
+    return failures
+
+
+async def _main(args: argparse.Namespace) -> int:
+    applied = await apply_migrations()
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none'}")
+    if args.verify_indexes and await verify_index_usage():
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply schema migrations.")
+    parser.add_argument(
+        "--verify-indexes",
+        action="store_true",
+        help="EXPLAIN ANALYZE the hot post queries and fail on sequential scans.",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
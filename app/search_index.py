@@ -0,0 +1,120 @@
+import bisect
+import math
+import re
+from collections import defaultdict
+from app.models import Post
+
+"""
+Tokenization shared by the Postgres full-text search and the in-process
+inverted index used when the database cannot be reached.
+
+Words are lowercased; a hashtag such as `#AI` is indexed both as the plain
+word `ai` and as the tag `#ai`, matching the `search_vector` trigger in
+schema.sql. Every query term is matched as a prefix.
+"""
+
+TOKEN_PATTERN = re.compile(r"#?[^\W_]+")
+
+
+def tokenize(content: str) -> list[str]:
+    tokens = []
+    for match in TOKEN_PATTERN.findall(content.lower()):
+        if match.startswith("#"):
+            tokens.append(match)
+            match = match[1:]
+        tokens.append(match)
+    return tokens
+
+
+def query_terms(query: str) -> list[str]:
+    return list(dict.fromkeys(TOKEN_PATTERN.findall(query.lower())))
+
+
+def matches_terms(content: str, terms: list[str]) -> bool:
+    tokens = set(tokenize(content))
+    return all(any(token.startswith(term) for token in tokens) for term in terms)
+
+
+def to_tsquery(terms: list[str]) -> str:
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+class PostSearchIndex:
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._doc_terms: dict[int, list[str]] = {}
+        self._publication_dates: dict[int, str] = {}
+        self._sorted_terms: list[str] = []
+        self._terms_dirty = False
+
+    @classmethod
+    def from_posts(cls, posts: list[Post]) -> "PostSearchIndex":
+        index = cls()
+        for post in posts:
+            index.add(post)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, post: Post):
+        post_id = post["id"]
+        if post_id in self._doc_terms:
+            self.remove(post_id)
+        tokens = tokenize(post["content"])
+        counts: dict[str, int] = defaultdict(int)
+        for token in tokens:
+            counts[token] += 1
+        for token, count in counts.items():
+            if token not in self._postings:
+                self._terms_dirty = True
+            self._postings[token][post_id] = count
+        self._doc_terms[post_id] = list(counts)
+        self._publication_dates[post_id] = post["publication_date"]
+
+    def remove(self, post_id: int):
+        for token in self._doc_terms.pop(post_id, []):
+            postings = self._postings[token]
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[token]
+                self._terms_dirty = True
+        self._publication_dates.pop(post_id, None)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + "\U0010ffff")
+        return self._sorted_terms[start:end]
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        total_docs = len(self._doc_terms) or 1
+        scores: dict[int, float] | None = None
+        for term in terms:
+            term_scores: dict[int, float] = defaultdict(float)
+            for token in self._expand_prefix(term):
+                postings = self._postings[token]
+                idf = math.log(1 + total_docs / len(postings))
+                for post_id, count in postings.items():
+                    term_scores[post_id] += (1 + math.log(count)) * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    post_id: score + term_scores[post_id]
+                    for post_id, score in scores.items()
+                    if post_id in term_scores
+                }
+            if not scores:
+                return []
+        ranked = sorted(
+            scores,
+            key=lambda post_id: (scores[post_id], self._publication_dates[post_id]),
+            reverse=True,
+        )
+        return ranked[:limit] if limit is not None else ranked
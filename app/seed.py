@@ -0,0 +1,263 @@
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from typing import Iterator
+from sqlalchemy import text
+from app.database import db_session
+from app.metrics_store import rollup_metrics, utc_today
+from app.post_repository import post_repository
+
+"""
+Synthetic data seeder for load testing.
+
+Generates a reproducible stream of realistic posts (varied content length,
+hashtags, statuses, dates and metrics) and streams them into the posts table
+in batches, using COPY when the async driver is asyncpg and a multi-row
+executemany INSERT otherwise. It can also seed post_metrics samples for
+the published posts and roll them up.
+
+Usage:
+    python -m app.seed --count 1000000 --batch-size 10000 --seed 42
+    python -m app.seed --count 0 --metrics-days 365
+"""
+
+SEED_COLUMNS = [
+    "content",
+    "publication_date",
+    "status",
+    "likes",
+    "comments",
+    "engagement_rate",
+    "media_urls",
+    "created_at",
+    "scheduled_at",
+]
+
+METRIC_COLUMNS = ["post_id", "recorded_at", "likes", "comments", "impressions"]
+
+TOPICS = [
+    "AI",
+    "WebDev",
+    "Leadership",
+    "Startups",
+    "Python",
+    "DataScience",
+    "Marketing",
+    "RemoteWork",
+    "Careers",
+    "Reflex",
+    "Cloud",
+    "Productivity",
+]
+OPENERS = [
+    "Excited to share",
+    "Here is what I learned about",
+    "Hot take on",
+    "Three lessons from a year of",
+    "We just shipped something around",
+    "A quick thread on",
+    "Unpopular opinion about",
+    "What nobody tells you about",
+]
+SENTENCES = [
+    "Small, consistent improvements compound faster than big rewrites.",
+    "The best teams write things down before they build them.",
+    "Measure first, then optimize the part that actually matters.",
+    "Shipping early beats polishing in private.",
+    "Feedback loops are the real product.",
+    "Hiring for curiosity has paid off every single time.",
+    "Most of our wins came from deleting code, not adding it.",
+    "Clear ownership removes half of the meetings on the calendar.",
+    "Customers rarely ask for features; they ask for outcomes.",
+    "Good documentation is a force multiplier for the whole company.",
+]
+STATUS_WEIGHTS = {"Published": 0.7, "Draft": 0.2, "Scheduled": 0.1}
+
+
+def generate_posts(count: int, seed: int = 42) -> Iterator[dict]:
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    for _ in range(count):
+        topic = rng.choice(TOPICS)
+        sentence_count = min(int(rng.expovariate(1 / 4)) + 1, 40)
+        body = " ".join(rng.choice(SENTENCES) for _ in range(sentence_count))
+        hashtags = " ".join(
+            f"#{tag}" for tag in rng.sample(TOPICS, rng.randint(0, 4))
+        )
+        content = f"{rng.choice(OPENERS)} {topic}. {body} {hashtags}".strip()[:3000]
+        status = rng.choices(statuses, weights)[0]
+        if status == "Scheduled":
+            publication_date = today + datetime.timedelta(days=rng.randint(1, 60))
+        else:
+            publication_date = today - datetime.timedelta(days=rng.randint(0, 730))
+        if status == "Published":
+            likes = int(rng.lognormvariate(3.5, 1.2))
+            comments = int(likes * rng.uniform(0.02, 0.3))
+            engagement_rate = round(min(rng.lognormvariate(1.0, 0.7), 40.0), 2)
+        else:
+            likes, comments, engagement_rate = 0, 0, 0.0
+        media_urls = [
+            f"https://example.com/media/{rng.getrandbits(64):016x}.jpg"
+            for _ in range(rng.choices([0, 1, 2, 4], [0.6, 0.3, 0.08, 0.02])[0])
+        ]
+        scheduled_at = None
+        if status == "Scheduled":
+            scheduled_at = datetime.datetime.combine(
+                publication_date,
+                datetime.time(rng.randint(6, 21), rng.choice([0, 15, 30, 45])),
+                datetime.timezone.utc,
+            )
+        created_at = datetime.datetime.combine(
+            min(publication_date, today), datetime.time(), datetime.timezone.utc
+        ) - datetime.timedelta(minutes=rng.randint(0, 7 * 24 * 60))
+        yield {
+            "content": content,
+            "publication_date": publication_date,
+            "status": status,
+            "likes": likes,
+            "comments": comments,
+            "engagement_rate": engagement_rate,
+            "media_urls": media_urls,
+            "created_at": created_at,
+            "scheduled_at": scheduled_at,
+        }
+
+
+def _batches(rows: Iterator[dict], batch_size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def insert_rows(session, table: str, columns: list[str], rows: list[dict]):
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if hasattr(driver_connection, "copy_records_to_table"):
+        await driver_connection.copy_records_to_table(
+            table,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+    else:
+        await session.execute(
+            text(f"""
+                INSERT INTO {table} ({", ".join(columns)})
+                VALUES ({", ".join(f":{c}" for c in columns)})
+            """),
+            rows,
+        )
+
+
+async def insert_posts(session, rows: list[dict]):
+    await insert_rows(session, "posts", SEED_COLUMNS, rows)
+
+
+def generate_metric_samples(
+    post_ids: list[int], days: int, samples_per_day: int = 4, seed: int = 42
+) -> Iterator[dict]:
+    rng = random.Random(seed)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    interval = datetime.timedelta(hours=24 / samples_per_day)
+    for post_id in post_ids:
+        reach = rng.lognormvariate(4.0, 1.0)
+        for step in range(days * samples_per_day):
+            age = days * samples_per_day - step
+            decay = 1 / (1 + age / (samples_per_day * 7))
+            impressions = int(rng.expovariate(1 / (reach * decay)))
+            likes = int(impressions * rng.uniform(0.01, 0.08))
+            yield {
+                "post_id": post_id,
+                "recorded_at": now - interval * age,
+                "likes": likes,
+                "comments": int(likes * rng.uniform(0.0, 0.3)),
+                "impressions": impressions,
+            }
+
+
+async def seed_posts(count: int, batch_size: int = 10000, seed: int = 42) -> float:
+    inserted = 0
+    started = time.perf_counter()
+    async with db_session() as session:
+        for batch in _batches(generate_posts(count, seed), batch_size):
+            await insert_posts(session, batch)
+            await session.commit()
+            inserted += len(batch)
+            elapsed = time.perf_counter() - started
+            print(
+                f"Seeded {inserted:,}/{count:,} posts ({inserted / elapsed:,.0f} rows/sec)"
+            )
+    post_repository.invalidate()
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed else 0.0
+    print(f"Done: {inserted:,} posts in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+    return rate
+
+
+async def seed_post_metrics(
+    days: int, samples_per_day: int = 4, batch_size: int = 10000, seed: int = 42
+) -> float:
+    async with db_session() as session:
+        result = await session.execute(
+            text("SELECT id FROM posts WHERE status = 'Published' ORDER BY id")
+        )
+        post_ids = list(result.scalars().all())
+    total = len(post_ids) * days * samples_per_day
+    inserted = 0
+    started = time.perf_counter()
+    async with db_session() as session:
+        for batch in _batches(
+            generate_metric_samples(post_ids, days, samples_per_day, seed), batch_size
+        ):
+            await insert_rows(session, "post_metrics", METRIC_COLUMNS, batch)
+            await session.commit()
+            inserted += len(batch)
+            elapsed = time.perf_counter() - started
+            print(
+                f"Seeded {inserted:,}/{total:,} metric samples ({inserted / elapsed:,.0f} rows/sec)"
+            )
+    await rollup_metrics(utc_today() - datetime.timedelta(days=days))
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed else 0.0
+    print(f"Done: {inserted:,} metric samples and rollups in {elapsed:.1f}s")
+    return rate
+
+
+async def _seed(args: argparse.Namespace):
+    if args.count:
+        await seed_posts(args.count, args.batch_size, args.seed)
+    if args.metrics_days:
+        await seed_post_metrics(
+            args.metrics_days, args.samples_per_day, args.batch_size, args.seed
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the posts table with synthetic data.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--metrics-days",
+        type=int,
+        default=0,
+        help="Also seed this many days of post_metrics samples for published posts.",
+    )
+    parser.add_argument("--samples-per-day", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(_seed(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,170 @@
 import reflex as rx
-import random
 import datetime
-from app.models import Post
+from app.change_feed import subscribe
+from app.models import Post, PostOption
+from app.metrics_store import fetch_trend, utc_today
+from app.post_repository import (
+    TOP_METRICS,
+    post_repository,
+    top_posts_in_memory,
+    watermark_is_current,
+)
 from typing import TypedDict
 import logging
-from sqlalchemy import text
+
+TOP_POSTS_COUNT = 3
+TOP_WINDOW_DAYS = (0, 7, 30, 90)
 
 
 class DailyInteraction(TypedDict):
     date: str
     interactions: int
+    height: int
 
 
 class AnalyticsState(rx.State):
-    posts: list[Post] = []
+    post_query: str = ""
+    post_suggestions: list[PostOption] = []
     selected_post_id: str = ""
+    selected_post: Post | None = None
     trend_data: list[DailyInteraction] = []
+    trend_window_days: int = 7
+    top_posts: list[Post] = []
+    top_metric: str = "engagement_rate"
+    top_window_days: int = 0
+    _watermark: datetime.datetime | None = None
 
     @rx.event
     async def on_load_analytics(self):
+        subscribe(self)
         return self._fetch_posts
 
     async def _fetch_posts(self):
         try:
-            async with rx.asession() as session:
-                result = await session.execute(
-                    text(
-                        "SELECT id, content, publication_date, status, likes, comments, engagement_rate, media_urls, created_at FROM posts WHERE status = 'Published' ORDER BY publication_date DESC"
-                    )
-                )
-                posts_from_db = result.mappings().all()
-                posts_list = []
-                for p in posts_from_db:
-                    post_dict = dict(p)
-                    post_dict["publication_date"] = p.publication_date.isoformat()
-                    if post_dict.get("media_urls") is None:
-                        post_dict["media_urls"] = []
-                    posts_list.append(post_dict)
-                self.posts = posts_list
-                if self.posts and (not self.selected_post_id):
-                    self.selected_post_id = str(self.posts[0]["id"])
-                    self._generate_trend_data()
+            if watermark_is_current(self._watermark):
+                (
+                    posts,
+                    deleted_ids,
+                    self._watermark,
+                ) = await post_repository.fetch_changes_since(self._watermark)
+                if posts or deleted_ids:
+                    await self.apply_post_changes(posts, deleted_ids)
+                    await self._fetch_suggestions()
+                return
+            self._watermark = await post_repository.fetch_watermark()
+            await self._fetch_suggestions(fresh=True)
+            await self._fetch_top_posts(fresh=True)
+            if self.selected_post_id:
+                await self._load_selected_post(fresh=True)
+            elif self.post_suggestions:
+                self.selected_post_id = self.post_suggestions[0]["id"]
+                await self._load_selected_post(fresh=True)
+                await self._fetch_trend_data()
         except Exception as e:
             logging.exception(f"Error fetching posts for analytics: {e}")
 
-    @rx.var
-    def selected_post(self) -> Post | None:
-        if not self.selected_post_id:
-            return None
-        for p in self.posts:
-            if str(p["id"]) == self.selected_post_id:
-                return p
-        return None
-
-    @rx.var
-    def top_posts(self) -> list[Post]:
-        return sorted(
-            [p for p in self.posts if p["status"] == "Published"],
-            key=lambda p: p["engagement_rate"],
-            reverse=True,
-        )[:3]
-
-    def _generate_trend_data(self):
+    async def _fetch_suggestions(self, fresh: bool = False):
+        self.post_suggestions = await post_repository.suggest_posts(
+            self.post_query, fresh=fresh
+        )
+
+    @rx.event
+    async def set_post_query(self, query: str):
+        self.post_query = query
+        try:
+            await self._fetch_suggestions()
+        except Exception as e:
+            logging.exception(f"Error searching posts for analytics: {e}")
+            self.post_suggestions = []
+
+    async def _load_selected_post(self, fresh: bool = False):
+        self.selected_post = await post_repository.fetch_post(
+            int(self.selected_post_id), fresh=fresh
+        )
+
+    async def _fetch_top_posts(self, fresh: bool = False):
+        start = None
+        if self.top_window_days:
+            start = utc_today() - datetime.timedelta(
+                days=self.top_window_days
+            )
+        try:
+            self.top_posts = await post_repository.fetch_top_posts(
+                self.top_metric, TOP_POSTS_COUNT, start=start, fresh=fresh
+            )
+        except Exception as e:
+            logging.exception(f"Top posts query failed, ranking cached posts: {e}")
+            self.top_posts = top_posts_in_memory(
+                post_repository.cached_posts(status="Published"),
+                self.top_metric,
+                TOP_POSTS_COUNT,
+                start=start.isoformat() if start else None,
+            )
+
+    async def apply_post_changes(self, posts: list[Post], deleted_ids: list[int]):
+        deleted = set(deleted_ids)
+        changed = {p["id"]: p for p in posts}
+        if self.selected_post is not None:
+            selected_id = self.selected_post["id"]
+            if selected_id in deleted:
+                self.selected_post = None
+                self.selected_post_id = ""
+                self.trend_data = []
+            elif selected_id in changed:
+                self.selected_post = changed[selected_id]
+        top_ids = {p["id"] for p in self.top_posts}
+        if top_ids & (deleted | set(changed)) or any(
+            p["status"] == "Published" for p in posts
+        ):
+            await self._fetch_top_posts()
+
+    @rx.event
+    async def set_top_metric(self, metric: str):
+        if metric not in TOP_METRICS:
+            return
+        self.top_metric = metric
+        await self._fetch_top_posts()
+
+    @rx.event
+    async def set_top_window_days(self, days: str):
+        if not days.isdigit() or int(days) not in TOP_WINDOW_DAYS:
+            return
+        self.top_window_days = int(days)
+        await self._fetch_top_posts()
+
+    async def _fetch_trend_data(self):
         self.trend_data = []
-        for i in range(7):
-            date = datetime.date.today() - datetime.timedelta(days=6 - i)
-            self.trend_data.append(
-                {"date": date.strftime("%b %d"), "interactions": random.randint(5, 50)}
+        if not self.selected_post_id:
+            return
+        end = utc_today()
+        start = end - datetime.timedelta(days=self.trend_window_days - 1)
+        try:
+            buckets = await fetch_trend(
+                int(self.selected_post_id),
+                start,
+                end,
+                weekly=self.trend_window_days > 90,
             )
+        except Exception as e:
+            logging.exception(f"Error fetching trend data: {e}")
+            return
+        peak = max((interactions for _, interactions in buckets), default=0) or 1
+        self.trend_data = [
+            {
+                "date": day.strftime("%b %d"),
+                "interactions": interactions,
+                "height": round(interactions * 100 / peak),
+            }
+            for day, interactions in buckets
+        ]
 
     @rx.event
-    def select_post(self, post_id: str):
+    async def select_post(self, post_id: str):
         self.selected_post_id = post_id
-        self._generate_trend_data()
\ No newline at end of file
+        self.post_query = ""
+        try:
+            await self._load_selected_post()
+        except Exception as e:
+            logging.exception(f"Error loading post {post_id} for analytics: {e}")
+            self.selected_post = None
+        await self._fetch_trend_data()
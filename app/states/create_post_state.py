@@ -2,11 +2,22 @@ import reflex as rx
 from typing import TypedDict, Literal
 import asyncio
 import datetime
+import json
 import logging
+import time
 import uuid
-from app.supabase_client import db
-from app.models import Post
+from app import storage
+from app.ai_backend import GenerationMetrics, GenerationTimer
+from app.ai_cache import assistant_backend
+from app.chat_memory import build_model_messages, split_window, summarize
+from app.media_processing import upload_with_derivatives
+from app.models import MediaAsset, Post
+from app.post_repository import post_repository
+from app.post_scheduler import post_scheduler
 from sqlalchemy import text
+from app.database import db_session
+
+STREAM_FLUSH_SECONDS = 0.05
 
 
 class ChatMessage(TypedDict):
@@ -14,19 +25,44 @@ class ChatMessage(TypedDict):
     content: str
 
 
+class UploadProgress(TypedDict):
+    file_name: str
+    status: Literal["uploading", "done", "error"]
+
+
 class CreatePostState(rx.State):
     post_content: str = ""
-    uploaded_media_urls: list[str] = []
+    schedule_date: str = ""
+    schedule_time: str = ""
+    uploaded_media: list[MediaAsset] = []
+    upload_progress: list[UploadProgress] = []
     ai_assistant_open: bool = False
     ai_prompt: str = ""
     ai_response: str = ""
     ai_processing: bool = False
     chat_history: list[ChatMessage] = []
+    archived_message_count: int = 0
+    _archived_chat: list[ChatMessage] = []
+    _chat_summary: str = ""
+    ai_metrics: GenerationMetrics = {
+        "ttft_ms": 0.0,
+        "total_ms": 0.0,
+        "tokens": 0,
+        "tokens_per_second": 0.0,
+    }
 
     @rx.event
     def set_post_content(self, content: str):
         self.post_content = content
 
+    @rx.event
+    def set_schedule_date(self, value: str):
+        self.schedule_date = value
+
+    @rx.event
+    def set_schedule_time(self, value: str):
+        self.schedule_time = value
+
     @rx.event
     def set_ai_prompt(self, prompt: str):
         self.ai_prompt = prompt
@@ -41,35 +77,49 @@ class CreatePostState(rx.State):
 
     @rx.event
     async def handle_upload(self, files: list[rx.UploadFile]):
-        if db is None:
-            yield rx.toast.error("Storage not configured. Cannot upload files.")
-            return
-        for file in files:
-            upload_data = await file.read()
-            file_extension = file.name.split(".")[-1]
-            file_name = f"{uuid.uuid4()}.{file_extension}"
+        self.upload_progress = [
+            {"file_name": file.name, "status": "uploading"} for file in files
+        ]
+        yield
+
+        async def upload_one(index: int, file: rx.UploadFile):
             try:
-                db.storage.from_("media").upload(
-                    file=upload_data,
-                    path=file_name,
-                    file_options={"content-type": file.content_type},
-                )
-                public_url = db.storage.from_("media").get_public_url(file_name)
-                self.uploaded_media_urls.append(public_url)
+                file_extension = file.name.split(".")[-1]
+                file_name = f"{uuid.uuid4()}.{file_extension}"
+                asset = await upload_with_derivatives(file, file_name)
+                return index, asset
             except Exception as e:
                 logging.exception(f"Failed to upload {file.name}: {e}")
-                yield rx.toast.error(f"Failed to upload {file.name}.")
+                return index, None
+
+        for upload in asyncio.as_completed(
+            [upload_one(index, file) for index, file in enumerate(files)]
+        ):
+            index, asset = await upload
+            if asset is None:
+                self.upload_progress[index]["status"] = "error"
+                yield rx.toast.error(f"Failed to upload {files[index].name}.")
+            else:
+                self.upload_progress[index]["status"] = "done"
+                self.uploaded_media.append(asset)
+                yield
         yield rx.clear_selected_files("media_upload")
 
     @rx.event
-    def remove_media(self, url: str):
-        self.uploaded_media_urls.remove(url)
-        if db is not None:
-            try:
-                file_name = url.split("/")[-1]
-                db.storage.from_("media").remove([file_name])
-            except Exception as e:
-                logging.exception(f"Failed to remove file from storage: {e}")
+    async def remove_media(self, url: str):
+        asset = next((a for a in self.uploaded_media if a["url"] == url), None)
+        if asset is None:
+            return
+        self.uploaded_media = [a for a in self.uploaded_media if a["url"] != url]
+        try:
+            asset_urls = {
+                asset[key]
+                for key in ("url", "thumbnail_url", "web_url", "poster_url")
+                if asset[key]
+            }
+            await storage.remove_media([u.split("/")[-1] for u in asset_urls])
+        except Exception as e:
+            logging.exception(f"Failed to remove file from storage: {e}")
 
     @rx.event
     def toggle_ai_assistant(self):
@@ -82,15 +132,40 @@ class CreatePostState(rx.State):
         self.ai_processing = True
         self.ai_response = ""
         self.chat_history.append({"role": "user", "content": self.ai_prompt})
-        user_prompt = self.ai_prompt
+        self._compact_chat_history()
         self.ai_prompt = ""
         yield
-        await asyncio.sleep(1.5)
-        response_text = f"This is an AI-generated response for: '{user_prompt}'. It could be a more detailed and professional post about this topic, ready for LinkedIn."
-        self.ai_response = response_text
-        self.chat_history.append({"role": "assistant", "content": response_text})
+        timer = GenerationTimer(assistant_backend.name)
+        last_flush = time.monotonic()
+        try:
+            async for token in assistant_backend.stream(
+                build_model_messages(self._chat_summary, self.chat_history)
+            ):
+                timer.record_token()
+                self.ai_response += token
+                if time.monotonic() - last_flush >= STREAM_FLUSH_SECONDS:
+                    last_flush = time.monotonic()
+                    yield
+        except Exception as e:
+            logging.exception(f"AI assistant request failed: {e}")
+            yield rx.toast.error("The AI assistant is unavailable right now.")
+        self.ai_metrics = timer.finish()
+        if self.ai_response:
+            self.chat_history.append(
+                {"role": "assistant", "content": self.ai_response}
+            )
+            self._compact_chat_history()
         self.ai_processing = False
 
+    def _compact_chat_history(self):
+        archived, window = split_window(self.chat_history)
+        if not archived:
+            return
+        self._archived_chat = self._archived_chat + archived
+        self._chat_summary = summarize(self._chat_summary, archived)
+        self.archived_message_count = len(self._archived_chat)
+        self.chat_history = window
+
     @rx.event
     def use_ai_content(self):
         self.post_content = self.ai_response
@@ -98,29 +173,53 @@ class CreatePostState(rx.State):
         self.ai_assistant_open = False
         return rx.toast.success("AI content inserted!")
 
-    async def _create_post_in_db(self, status: Literal["Draft", "Published"]):
+    async def _create_post_in_db(
+        self,
+        status: Literal["Draft", "Published", "Scheduled"],
+        scheduled_at: datetime.datetime | None = None,
+    ):
         if not self.post_content.strip():
             yield rx.toast.error("Post content cannot be empty.")
             return
         try:
-            async with rx.asession() as session:
-                await session.execute(
+            async with db_session() as session:
+                result = await session.execute(
                     text("""
-                        INSERT INTO posts (content, publication_date, status, media_urls)
-                        VALUES (:content, :publication_date, :status, :media_urls)
+                        INSERT INTO posts (content, publication_date, status, scheduled_at, media_urls, media_derivatives)
+                        VALUES (:content, :publication_date, :status, :scheduled_at, :media_urls, CAST(:media_derivatives AS jsonb))
+                        RETURNING id
                     """),
                     {
                         "content": self.post_content,
-                        "publication_date": datetime.date.today(),
+                        "publication_date": scheduled_at.date()
+                        if scheduled_at
+                        else datetime.date.today(),
                         "status": status,
-                        "media_urls": list(self.uploaded_media_urls),
+                        "scheduled_at": scheduled_at,
+                        "media_urls": [a["url"] for a in self.uploaded_media],
+                        "media_derivatives": json.dumps(
+                            {
+                                a["url"]: {
+                                    "thumbnail": a["thumbnail_url"],
+                                    "web": a["web_url"],
+                                    "poster": a["poster_url"],
+                                }
+                                for a in self.uploaded_media
+                            }
+                        ),
                     },
                 )
+                post_id = result.scalar_one()
                 await session.commit()
+            post_repository.invalidate()
+            if scheduled_at is not None:
+                post_scheduler.schedule(post_id, scheduled_at)
             self.post_content = ""
-            self.uploaded_media_urls = []
+            self.schedule_date = ""
+            self.schedule_time = ""
+            self.uploaded_media = []
             message = f"Post successfully saved as {status.lower()}!"
-            toast_method = rx.toast.info if status == "Draft" else rx.toast.success
+            toast_method = rx.toast.success if status == "Published" else rx.toast.info
             yield toast_method(message)
             yield rx.redirect("/")
         except Exception as e:
@@ -137,4 +236,21 @@ class CreatePostState(rx.State):
     @rx.event
     async def publish_post(self):
         async for event in self._create_post_in_db(status="Published"):
-            yield event
\ No newline at end of file
+            yield event
+
+    @rx.event
+    async def schedule_post(self):
+        try:
+            scheduled_at = datetime.datetime.fromisoformat(
+                f"{self.schedule_date}T{self.schedule_time or '09:00'}"
+            ).replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            yield rx.toast.error("Pick a date and time to schedule the post.")
+            return
+        if scheduled_at <= datetime.datetime.now(datetime.timezone.utc):
+            yield rx.toast.error("The scheduled time must be in the future.")
+            return
+        async for event in self._create_post_in_db(
+            status="Scheduled", scheduled_at=scheduled_at
+        ):
+            yield event
@@ -1,64 +1,286 @@
 import reflex as rx
 from typing import Literal
+import datetime
 import logging
-from sqlalchemy import text
-from app.models import Post
+from app.bulk_actions import (
+    BULK_STATUSES,
+    BulkActionError,
+    archive_posts,
+    delete_posts,
+    reschedule_posts,
+    set_posts_status,
+)
+from app.change_feed import subscribe
+from app.models import Post, PostPreview
+from app.post_repository import (
+    MANAGEMENT_PREVIEW_LENGTH,
+    SEARCH_RESULT_LIMIT,
+    post_repository,
+    watermark_is_current,
+)
+from app.search_index import query_terms
+
+MANAGEMENT_PAGE_SIZE = 24
 
 
 class ManagementState(rx.State):
-    posts: list[Post] = []
-    filter_status: Literal["All", "Published", "Draft", "Scheduled"] = "All"
+    filter_status: Literal["All", "Published", "Draft", "Scheduled", "Archived"] = "All"
     search_query: str = ""
+    search_truncated: bool = False
+    page_posts: list[PostPreview] = []
+    current_page: int = 1
+    has_next_page: bool = False
+    opened_post: Post | None = None
+    selected_post_ids: list[int] = []
+    bulk_status: str = "Draft"
+    bulk_schedule_date: str = ""
+    bulk_schedule_time: str = ""
+    _page_cursors: dict[int, tuple] = {}
+    _search_ids: list[int] = []
+    _watermark: datetime.datetime | None = None
 
     @rx.event
     async def on_load_posts(self):
+        subscribe(self)
         return self._fetch_posts
 
     async def _fetch_posts(self):
         try:
-            async with rx.asession() as session:
-                result = await session.execute(
-                    text(
-                        "SELECT id, content, publication_date, status, likes, comments, engagement_rate, media_urls, created_at FROM posts ORDER BY publication_date DESC"
-                    )
-                )
-                posts_from_db = result.mappings().all()
-                posts_list = []
-                for p in posts_from_db:
-                    post_dict = dict(p)
-                    post_dict["publication_date"] = p.publication_date.isoformat()
-                    if post_dict.get("media_urls") is None:
-                        post_dict["media_urls"] = []
-                    posts_list.append(post_dict)
-                self.posts = posts_list
+            if watermark_is_current(self._watermark):
+                (
+                    posts,
+                    deleted_ids,
+                    self._watermark,
+                ) = await post_repository.fetch_changes_since(self._watermark)
+                if posts or deleted_ids:
+                    await self.apply_post_changes(posts, deleted_ids)
+                return
+            self._watermark = await post_repository.fetch_watermark()
+            self.opened_post = None
+            self.selected_post_ids = []
+            await self._reset_results(fresh=True)
         except Exception as e:
             logging.exception(f"Error fetching posts for management: {e}")
 
-    @rx.var
-    def filtered_posts(self) -> list[Post]:
-        posts_to_filter = self.posts
-        if self.filter_status != "All":
-            posts_to_filter = [
-                p for p in posts_to_filter if p["status"] == self.filter_status
-            ]
-        if self.search_query:
-            posts_to_filter = [
-                p
-                for p in posts_to_filter
-                if self.search_query.lower() in p["content"].lower()
-            ]
-        return posts_to_filter
+    def _status(self) -> str | None:
+        return None if self.filter_status == "All" else self.filter_status
+
+    async def _reset_results(self, fresh: bool = False):
+        self.current_page = 1
+        self._page_cursors = {}
+        await self._reload_results(fresh=fresh)
+
+    async def _reload_results(self, fresh: bool = False):
+        terms = query_terms(self.search_query)
+        self._search_ids = (
+            await self._search_matches(" ".join(terms), fresh) if terms else []
+        )
+        self.search_truncated = len(self._search_ids) >= SEARCH_RESULT_LIMIT
+        await self._load_page(fresh=fresh)
+
+    async def _search_matches(self, query: str, fresh: bool) -> list[int]:
+        status = self._status()
+        try:
+            return await post_repository.search_post_ids(
+                query, status=status, fresh=fresh
+            )
+        except Exception as e:
+            logging.exception(f"Full-text search failed, using local index: {e}")
+            posts = post_repository.cached_posts()
+            statuses = {p["id"]: p["status"] for p in posts}
+            return [
+                post_id
+                for post_id in post_repository.local_search_index(posts).search(query)
+                if status is None or statuses.get(post_id) == status
+            ][:SEARCH_RESULT_LIMIT]
+
+    async def _load_page(self, fresh: bool = False):
+        try:
+            if query_terms(self.search_query):
+                start = (self.current_page - 1) * MANAGEMENT_PAGE_SIZE
+                self.page_posts = await post_repository.fetch_previews_by_ids(
+                    self._search_ids[start : start + MANAGEMENT_PAGE_SIZE],
+                    MANAGEMENT_PREVIEW_LENGTH,
+                )
+                self.has_next_page = start + MANAGEMENT_PAGE_SIZE < len(
+                    self._search_ids
+                )
+                return
+            cursor = self._page_cursors.get(self.current_page)
+            offset = 0
+            if self.current_page > 1 and cursor is None:
+                offset = (self.current_page - 1) * MANAGEMENT_PAGE_SIZE
+            self.page_posts, next_cursor = await post_repository.fetch_page(
+                "publication_date",
+                False,
+                MANAGEMENT_PAGE_SIZE,
+                cursor=cursor,
+                offset=offset,
+                preview_length=MANAGEMENT_PREVIEW_LENGTH,
+                status=self._status(),
+                fresh=fresh,
+            )
+            if next_cursor is not None:
+                self._page_cursors[self.current_page + 1] = next_cursor
+            self.has_next_page = len(self.page_posts) == MANAGEMENT_PAGE_SIZE
+        except Exception as e:
+            logging.exception(f"Error fetching management page: {e}")
 
     @rx.event
-    def set_filter_status(
-        self, status: Literal["All", "Published", "Draft", "Scheduled"]
+    async def set_filter_status(
+        self, status: Literal["All", "Published", "Draft", "Scheduled", "Archived"]
     ):
         self.filter_status = status
+        await self._reset_results()
 
     @rx.event
-    def set_search_query(self, query: str):
+    async def set_search_query(self, query: str):
         self.search_query = query
+        await self._reset_results()
+
+    @rx.event
+    async def next_page(self):
+        if self.has_next_page:
+            self.current_page += 1
+            await self._load_page()
+
+    @rx.event
+    async def prev_page(self):
+        if self.current_page > 1:
+            self.current_page -= 1
+            await self._load_page()
+
+    @rx.event
+    async def open_post(self, post_id: int):
+        if self.opened_post is not None and self.opened_post["id"] == post_id:
+            self.opened_post = None
+            return
+        try:
+            self.opened_post = await post_repository.fetch_post(post_id)
+        except Exception as e:
+            logging.exception(f"Error loading post {post_id}: {e}")
+
+    async def apply_post_changes(self, posts: list[Post], deleted_ids: list[int]):
+        deleted = set(deleted_ids)
+        changed = {p["id"]: p for p in posts}
+        if self.opened_post is not None:
+            opened_id = self.opened_post["id"]
+            if opened_id in deleted:
+                self.opened_post = None
+            elif opened_id in changed:
+                self.opened_post = changed[opened_id]
+        if deleted:
+            self.selected_post_ids = [
+                i for i in self.selected_post_ids if i not in deleted
+            ]
+        await self._reload_results()
+
+    @rx.var
+    def selected_count(self) -> int:
+        return len(self.selected_post_ids)
+
+    @rx.event
+    def toggle_post_selection(self, post_id: int):
+        if post_id in self.selected_post_ids:
+            self.selected_post_ids.remove(post_id)
+        else:
+            self.selected_post_ids.append(post_id)
+
+    @rx.event
+    def select_page(self):
+        self.selected_post_ids = [p["id"] for p in self.page_posts]
+
+    @rx.event
+    def clear_selection(self):
+        self.selected_post_ids = []
+
+    @rx.event
+    def set_bulk_status(self, status: str):
+        self.bulk_status = status
+
+    @rx.event
+    def set_bulk_schedule_date(self, value: str):
+        self.bulk_schedule_date = value
+
+    @rx.event
+    def set_bulk_schedule_time(self, value: str):
+        self.bulk_schedule_time = value
+
+    async def _refresh_after_write(self, changed_ids: list[int]):
+        changed = set(changed_ids)
+        self.selected_post_ids = [
+            post_id for post_id in self.selected_post_ids if post_id not in changed
+        ]
+        if self.opened_post is not None and self.opened_post["id"] in changed:
+            self.opened_post = await post_repository.fetch_post(self.opened_post["id"])
+        await self._reload_results()
+
+    async def _run_bulk_action(self, label: str, action):
+        post_ids = list(self.selected_post_ids)
+        if not post_ids:
+            yield rx.toast.info("Select at least one post first.")
+            return
+        try:
+            changed = await action(post_ids)
+        except BulkActionError as e:
+            logging.exception(f"Bulk {label} failed: {e}")
+            await self._refresh_after_write(e.changed)
+            yield rx.toast.error(
+                f"Could not {label} all selected posts; {len(e.changed)} were changed."
+            )
+            return
+        except Exception as e:
+            logging.exception(f"Bulk {label} failed: {e}")
+            yield rx.toast.error(f"Could not {label} the selected posts.")
+            return
+        await self._refresh_after_write(changed)
+        self.selected_post_ids = []
+        yield rx.toast.success(f"{label.capitalize()}d {len(changed)} post(s).")
+
+    @rx.event
+    async def bulk_archive(self):
+        async for event in self._run_bulk_action("archive", archive_posts):
+            yield event
+
+    @rx.event
+    async def bulk_delete(self):
+        async for event in self._run_bulk_action("delete", delete_posts):
+            yield event
+
+    @rx.event
+    async def bulk_change_status(self):
+        if self.bulk_status not in BULK_STATUSES:
+            return
+        status = self.bulk_status
+        async for event in self._run_bulk_action(
+            "update", lambda post_ids: set_posts_status(post_ids, status)
+        ):
+            yield event
+
+    @rx.event
+    async def bulk_reschedule(self):
+        try:
+            scheduled_at = datetime.datetime.fromisoformat(
+                f"{self.bulk_schedule_date}T{self.bulk_schedule_time or '09:00'}"
+            ).replace(tzinfo=datetime.timezone.utc)
+        except ValueError:
+            yield rx.toast.error("Pick a date and time to reschedule to.")
+            return
+        if scheduled_at <= datetime.datetime.now(datetime.timezone.utc):
+            yield rx.toast.error("The new time must be in the future.")
+            return
+        async for event in self._run_bulk_action(
+            "reschedule", lambda post_ids: reschedule_posts(post_ids, scheduled_at)
+        ):
+            yield event
 
     @rx.event
     async def archive_post(self, post_id: int):
-        yield rx.toast.info(f"Post {post_id} archived (simulated).")
\ No newline at end of file
+        try:
+            changed = await archive_posts([post_id])
+        except Exception as e:
+            logging.exception(f"Error archiving post {post_id}: {e}")
+            yield rx.toast.error("Could not archive the post.")
+            return
+        await self._refresh_after_write(changed)
+        yield rx.toast.success("Post archived.")
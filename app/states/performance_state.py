@@ -0,0 +1,118 @@
+import reflex as rx
+import datetime
+import logging
+from app.query_stats import (
+    RANKINGS,
+    QuerySnapshot,
+    QueryStat,
+    diff_snapshot,
+    fetch_query_stats,
+    list_snapshots,
+    reset_query_stats,
+    take_snapshot,
+)
+
+
+class PerformanceState(rx.State):
+    query_stats: list[QueryStat] = []
+    rank_by: str = "total_exec_time"
+    snapshots: list[QuerySnapshot] = []
+    snapshot_label: str = ""
+    baseline_snapshot_id: str = ""
+    against_snapshot_id: str = ""
+    diff_stats: list[QueryStat] = []
+    error_message: str = ""
+    is_loading: bool = False
+
+    @rx.event
+    async def on_load_performance(self):
+        self.is_loading = True
+        yield
+        await self._fetch_stats()
+
+    async def _fetch_stats(self):
+        try:
+            self.query_stats = await fetch_query_stats(self.rank_by)
+            self.snapshots = await list_snapshots()
+            self.error_message = ""
+        except Exception as e:
+            logging.exception(f"Error reading pg_stat_statements: {e}")
+            self.query_stats = []
+            self.error_message = "pg_stat_statements is not available. Preload the extension and run CREATE EXTENSION pg_stat_statements."
+        finally:
+            self.is_loading = False
+
+    @rx.event
+    async def set_rank_by(self, rank_by: str):
+        if rank_by not in RANKINGS:
+            return
+        self.rank_by = rank_by
+        self.is_loading = True
+        yield
+        await self._fetch_stats()
+
+    @rx.event
+    def set_snapshot_label(self, label: str):
+        self.snapshot_label = label
+
+    @rx.event
+    async def save_snapshot(self):
+        label = self.snapshot_label.strip() or datetime.datetime.now().strftime(
+            "%Y-%m-%d %H:%M"
+        )
+        try:
+            await take_snapshot(label)
+            self.snapshot_label = ""
+            self.snapshots = await list_snapshots()
+        except Exception as e:
+            logging.exception(f"Error saving query stats snapshot: {e}")
+            yield rx.toast.error("Could not save the snapshot.")
+            return
+        yield rx.toast.success(f"Snapshot '{label}' saved.")
+
+    @rx.event
+    async def compare_with_snapshot(self, snapshot_id: str):
+        self.baseline_snapshot_id = snapshot_id
+        if not snapshot_id:
+            self.against_snapshot_id = ""
+        async for event in self._diff():
+            yield event
+
+    @rx.event
+    async def compare_against_snapshot(self, snapshot_id: str):
+        self.against_snapshot_id = snapshot_id
+        async for event in self._diff():
+            yield event
+
+    async def _diff(self):
+        self.diff_stats = []
+        if not self.baseline_snapshot_id:
+            return
+        self.is_loading = True
+        yield
+        against_id = (
+            int(self.against_snapshot_id) if self.against_snapshot_id else None
+        )
+        try:
+            self.diff_stats = await diff_snapshot(
+                int(self.baseline_snapshot_id), against_id
+            )
+        except Exception as e:
+            logging.exception(f"Error diffing query stats snapshot: {e}")
+        finally:
+            self.is_loading = False
+
+    @rx.event
+    async def reset_stats(self):
+        try:
+            await reset_query_stats()
+        except Exception as e:
+            logging.exception(f"Error resetting pg_stat_statements: {e}")
+            yield rx.toast.error("Could not reset pg_stat_statements.")
+            return
+        self.baseline_snapshot_id = ""
+        self.against_snapshot_id = ""
+        self.diff_stats = []
+        self.is_loading = True
+        yield
+        await self._fetch_stats()
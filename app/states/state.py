@@ -4,7 +4,16 @@ import datetime
 import random
 import logging
 from sqlalchemy import text
-from app.models import Post
+from app.change_feed import subscribe
+from app.database import db_session, health
+from app.models import Post, PostPreview, PostStats
+from app.post_repository import (
+    DASHBOARD_PREVIEW_LENGTH,
+    SORT_EXPRESSIONS,
+    post_repository,
+    to_preview,
+    watermark_is_current,
+)
 
 
 class DashboardState(rx.State):
@@ -13,6 +22,7 @@ class DashboardState(rx.State):
         {"label": "Create Post", "icon": "file-plus-2", "href": "/create-post"},
         {"label": "Management", "icon": "folder-kanban", "href": "/management"},
         {"label": "Analytics", "icon": "bar-chart-3", "href": "/analytics"},
+        {"label": "Performance", "icon": "gauge", "href": "/performance"},
         {"label": "Settings", "icon": "settings", "href": "/settings"},
     ]
     db_connection_status: Literal["connected", "connecting", "error"] = "connecting"
@@ -26,37 +36,84 @@ class DashboardState(rx.State):
     items_per_page: int = 5
     sort_by: str = "publication_date"
     sort_ascending: bool = False
+    server_paging: bool = False
+    page_posts: list[PostPreview] = []
+    total_count: int = 0
+    stats: PostStats = {
+        "total_posts": 0,
+        "total_likes": 0,
+        "total_comments": 0,
+        "avg_engagement": 0.0,
+    }
+    _page_cursors: dict[int, tuple] = {}
+    _watermark: datetime.datetime | None = None
 
     @rx.event
     async def on_load(self):
+        subscribe(self)
         return self._fetch_posts
 
+    @rx.event
+    def sync_db_status(self):
+        self.db_connection_status = health.status
+
     async def _fetch_posts(self):
-        self.db_connection_status = "connecting"
+        self.db_connection_status = health.status
         try:
-            async with rx.asession() as session:
-                result = await session.execute(
-                    text(
-                        "SELECT id, content, publication_date, status, likes, comments, engagement_rate, media_urls, created_at FROM posts ORDER BY publication_date DESC"
-                    )
-                )
-                posts_from_db = result.mappings().all()
-                posts_list = []
-                for p in posts_from_db:
-                    post_dict = dict(p)
-                    post_dict["publication_date"] = p.publication_date.isoformat()
-                    if post_dict.get("media_urls") is None:
-                        post_dict["media_urls"] = []
-                    posts_list.append(post_dict)
-                self.posts = posts_list
+            if self.server_paging and watermark_is_current(self._watermark):
+                (
+                    posts,
+                    deleted_ids,
+                    self._watermark,
+                ) = await post_repository.fetch_changes_since(self._watermark)
                 self.db_connection_status = "connected"
-                if not self.posts:
-                    await self._generate_dummy_posts(local_only=False)
+                if posts or deleted_ids:
+                    await self.apply_post_changes(posts, deleted_ids)
+                return
+            self._watermark = await post_repository.fetch_watermark()
+            self.stats = await post_repository.fetch_stats(fresh=True)
+            self.db_connection_status = "connected"
+            if self.stats["total_posts"] == 0:
+                await self._generate_dummy_posts(local_only=False)
+                self.stats = await post_repository.fetch_stats()
+            self.server_paging = True
+            self.total_count = self.stats["total_posts"]
+            self._page_cursors = {}
+            self.current_page = 1
+            await self._fetch_page(fresh=True)
         except Exception as e:
             self.db_connection_status = "error"
+            self.server_paging = False
             logging.exception(f"Error fetching from DB: {e}")
             await self._generate_dummy_posts(local_only=True)
 
+    async def _fetch_page(self, fresh: bool = False):
+        cursor = self._page_cursors.get(self.current_page)
+        offset = 0
+        if self.current_page > 1 and cursor is None:
+            offset = (self.current_page - 1) * self.items_per_page
+        try:
+            self.page_posts, next_cursor = await post_repository.fetch_page(
+                self.sort_by,
+                self.sort_ascending,
+                self.items_per_page,
+                cursor=cursor,
+                offset=offset,
+                fresh=fresh,
+            )
+            if next_cursor is not None:
+                self._page_cursors[self.current_page + 1] = next_cursor
+        except Exception as e:
+            logging.exception(f"Error fetching dashboard page: {e}")
+
+    async def apply_post_changes(self, posts: list[Post], deleted_ids: list[int]):
+        if not self.server_paging:
+            return
+        self.stats = await post_repository.fetch_stats()
+        self.total_count = self.stats["total_posts"]
+        self.current_page = max(1, min(self.current_page, self.total_pages))
+        await self._fetch_page()
+
     async def _generate_dummy_posts(self, local_only: bool = True):
         statuses: list[Literal["Published", "Draft", "Scheduled"]] = [
             "Published",
@@ -77,6 +134,7 @@ class DashboardState(rx.State):
                 "comments": random.randint(0, 100),
                 "engagement_rate": round(random.uniform(0.5, 15.0), 2),
                 "media_urls": [],
+                "media_derivatives": {},
                 "created_at": datetime.datetime.now().isoformat(),
             }
             dummy_posts.append(post_dict)
@@ -84,36 +142,52 @@ class DashboardState(rx.State):
             self.posts = dummy_posts
         if not local_only:
             try:
-                async with rx.asession() as session:
-                    for post_data in dummy_posts:
-                        await session.execute(
-                            text("""INSERT INTO posts (id, content, publication_date, status, likes, comments, engagement_rate, media_urls)
-                                     VALUES (:id, :content, :publication_date, :status, :likes, :comments, :engagement_rate, :media_urls)
-                                     ON CONFLICT (id) DO NOTHING;"""),
-                            post_data,
-                        )
+                async with db_session() as session:
+                    await session.execute(
+                        text("""INSERT INTO posts (id, content, publication_date, status, likes, comments, engagement_rate, media_urls)
+                                 VALUES (:id, :content, :publication_date, :status, :likes, :comments, :engagement_rate, :media_urls)
+                                 ON CONFLICT (id) DO NOTHING;"""),
+                        [
+                            {
+                                **post_data,
+                                "publication_date": datetime.date.fromisoformat(
+                                    post_data["publication_date"]
+                                ),
+                            }
+                            for post_data in dummy_posts
+                        ],
+                    )
                     await session.commit()
+                post_repository.invalidate()
             except Exception as e:
                 logging.exception(f"Could not save dummy posts to DB: {e}")
 
     @rx.var
     def total_posts(self) -> int:
+        if self.server_paging:
+            return self.stats["total_posts"]
         return len(self.posts)
 
     @rx.var
     def total_likes(self) -> int:
+        if self.server_paging:
+            return self.stats["total_likes"]
         return sum(
             (post["likes"] for post in self.posts if post["status"] == "Published")
         )
 
     @rx.var
     def total_comments(self) -> int:
+        if self.server_paging:
+            return self.stats["total_comments"]
         return sum(
             (post["comments"] for post in self.posts if post["status"] == "Published")
         )
 
     @rx.var
     def avg_engagement(self) -> float:
+        if self.server_paging:
+            return self.stats["avg_engagement"]
         published_posts = [p for p in self.posts if p["status"] == "Published"]
         if not published_posts:
             return 0.0
@@ -127,34 +201,51 @@ class DashboardState(rx.State):
         )
 
     @rx.var
-    def paginated_posts(self) -> list[Post]:
+    def paginated_posts(self) -> list[PostPreview]:
+        if self.server_paging:
+            return self.page_posts
         start = (self.current_page - 1) * self.items_per_page
         end = start + self.items_per_page
-        return self.sorted_posts[start:end]
+        return [
+            to_preview(p, DASHBOARD_PREVIEW_LENGTH)
+            for p in self.sorted_posts[start:end]
+        ]
 
     @rx.var
     def total_pages(self) -> int:
-        return -(-len(self.posts) // self.items_per_page)
+        count = self.total_count if self.server_paging else len(self.posts)
+        return -(-count // self.items_per_page)
 
     @rx.event
-    def set_page(self, page_num: int):
+    async def set_page(self, page_num: int):
         self.current_page = max(1, min(page_num, self.total_pages))
+        if self.server_paging:
+            await self._fetch_page()
 
     @rx.event
-    def next_page(self):
+    async def next_page(self):
         if self.current_page < self.total_pages:
             self.current_page += 1
+            if self.server_paging:
+                await self._fetch_page()
 
     @rx.event
-    def prev_page(self):
+    async def prev_page(self):
         if self.current_page > 1:
             self.current_page -= 1
+            if self.server_paging:
+                await self._fetch_page()
 
     @rx.event
-    def set_sort_by(self, column: str):
+    async def set_sort_by(self, column: str):
+        if column not in SORT_EXPRESSIONS:
+            return
         if self.sort_by == column:
             self.sort_ascending = not self.sort_ascending
         else:
             self.sort_by = column
             self.sort_ascending = True
-        self.current_page = 1
\ No newline at end of file
+        self.current_page = 1
+        if self.server_paging:
+            self._page_cursors = {}
+            await self._fetch_page()
\ No newline at end of file
@@ -0,0 +1,235 @@
+import asyncio
+import base64
+import functools
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator
+import httpx
+import reflex as rx
+from app.supabase_client import db
+
+"""
+Media storage backends.
+
+Uploads are streamed: the incoming rx.UploadFile is read in fixed-size
+chunks and each chunk is forwarded to the backend before the next one is
+read, so memory per upload stays bounded regardless of file size.
+
+- SupabaseStorageBackend uses Supabase's resumable (TUS) upload endpoint,
+  sending 6 MB parts as required by Supabase.
+- LocalStorageBackend writes into the Reflex upload directory and is used
+  when Supabase is not configured (or MEDIA_STORAGE_BACKEND=local), so the
+  upload flow works offline.
+
+Blocking work (file writes, the synchronous Supabase remove call) runs on
+a small dedicated thread pool. MEDIA_UPLOAD_WORKERS (default 4) bounds how
+many uploads a worker runs at once; extra uploads queue without blocking
+other sessions.
+"""
+
+MEDIA_BUCKET = "media"
+UPLOAD_WORKERS = int(os.environ.get("MEDIA_UPLOAD_WORKERS", "4"))
+UPLOAD_CHUNK_SIZE = int(os.environ.get("MEDIA_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+SUPABASE_TUS_CHUNK_SIZE = 6 * 1024 * 1024
+
+_upload_executor = ThreadPoolExecutor(
+    max_workers=UPLOAD_WORKERS, thread_name_prefix="media-upload"
+)
+_upload_slots = asyncio.Semaphore(UPLOAD_WORKERS)
+
+
+async def _run_blocking(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_upload_executor, functools.partial(func, *args))
+
+
+async def read_chunks(
+    file: rx.UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def read_path_chunks(
+    path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    handle = await _run_blocking(open, path, "rb")
+    try:
+        while chunk := await _run_blocking(handle.read, chunk_size):
+            yield chunk
+    finally:
+        await _run_blocking(handle.close)
+
+
+async def tee_to_file(chunks: AsyncIterator[bytes], target: Path) -> AsyncIterator[bytes]:
+    handle = await _run_blocking(open, target, "wb")
+    try:
+        async for chunk in chunks:
+            await _run_blocking(handle.write, chunk)
+            yield chunk
+    finally:
+        await _run_blocking(handle.close)
+
+
+async def rechunk(chunks: AsyncIterator[bytes], size: int) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class StorageBackend(ABC):
+    @abstractmethod
+    async def upload_stream(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None,
+        size: int | None = None,
+    ) -> str: ...
+
+    @abstractmethod
+    async def remove(self, paths: list[str]): ...
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: Path | None = None):
+        self.root = root or rx.get_upload_dir() / MEDIA_BUCKET
+
+    async def upload_stream(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None,
+        size: int | None = None,
+    ) -> str:
+        target = self.root / path
+        await _run_blocking(target.parent.mkdir, 0o755, True, True)
+        handle = await _run_blocking(open, target, "wb")
+        try:
+            async for chunk in chunks:
+                await _run_blocking(handle.write, chunk)
+        except Exception:
+            await _run_blocking(handle.close)
+            await _run_blocking(target.unlink, True)
+            raise
+        await _run_blocking(handle.close)
+        return rx.get_upload_url(f"{MEDIA_BUCKET}/{path}")
+
+    async def remove(self, paths: list[str]):
+        for path in paths:
+            await _run_blocking((self.root / path).unlink, True)
+
+
+class SupabaseStorageBackend(StorageBackend):
+    def __init__(self, url: str, key: str):
+        self.url = url.rstrip("/")
+        self.key = key
+
+    def _tus_metadata(self, path: str, content_type: str) -> str:
+        metadata = {
+            "bucketName": MEDIA_BUCKET,
+            "objectName": path,
+            "contentType": content_type,
+            "cacheControl": "3600",
+        }
+        return ",".join(
+            f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in metadata.items()
+        )
+
+    async def upload_stream(
+        self,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str | None,
+        size: int | None = None,
+    ) -> str:
+        headers = {
+            "Authorization": f"Bearer {self.key}",
+            "apikey": self.key,
+            "Tus-Resumable": "1.0.0",
+        }
+        create_headers = {
+            **headers,
+            "Upload-Metadata": self._tus_metadata(
+                path, content_type or "application/octet-stream"
+            ),
+        }
+        if size is None:
+            create_headers["Upload-Defer-Length"] = "1"
+        else:
+            create_headers["Upload-Length"] = str(size)
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            response = await client.post(
+                f"{self.url}/storage/v1/upload/resumable", headers=create_headers
+            )
+            response.raise_for_status()
+            location = response.headers["Location"]
+            offset = 0
+            pending: bytes | None = None
+            async for part in rechunk(chunks, SUPABASE_TUS_CHUNK_SIZE):
+                if pending is not None:
+                    offset = await self._patch(client, location, headers, pending, offset)
+                pending = part
+            final_headers = dict(headers)
+            if size is None:
+                final_headers["Upload-Length"] = str(offset + len(pending or b""))
+            await self._patch(client, location, final_headers, pending or b"", offset)
+        return db.storage.from_(MEDIA_BUCKET).get_public_url(path)
+
+    async def _patch(
+        self,
+        client: httpx.AsyncClient,
+        location: str,
+        headers: dict[str, str],
+        part: bytes,
+        offset: int,
+    ) -> int:
+        response = await client.patch(
+            location,
+            headers={
+                **headers,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+            },
+            content=part,
+        )
+        response.raise_for_status()
+        return int(response.headers.get("Upload-Offset", offset + len(part)))
+
+    async def remove(self, paths: list[str]):
+        await _run_blocking(db.storage.from_(MEDIA_BUCKET).remove, paths)
+
+
+def get_storage_backend() -> StorageBackend:
+    backend = os.environ.get("MEDIA_STORAGE_BACKEND", "supabase" if db else "local")
+    if backend == "supabase" and db is not None:
+        return SupabaseStorageBackend(
+            os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"]
+        )
+    return LocalStorageBackend()
+
+
+storage_backend = get_storage_backend()
+
+
+async def upload_file(
+    file: rx.UploadFile, path: str, spool_to: Path | None = None
+) -> str:
+    chunks = read_chunks(file)
+    if spool_to is not None:
+        chunks = tee_to_file(chunks, spool_to)
+    async with _upload_slots:
+        return await storage_backend.upload_stream(
+            path, chunks, file.content_type, getattr(file, "size", None)
+        )
+
+
+async def remove_media(paths: list[str]):
+    await storage_backend.remove(paths)
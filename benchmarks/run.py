@@ -0,0 +1,380 @@
+import argparse
+import datetime
+import gc
+import json
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+from app.models import Post
+from app.post_repository import (
+    DASHBOARD_PREVIEW_LENGTH,
+    MANAGEMENT_PREVIEW_LENGTH,
+    POST_COLUMNS,
+    SUGGESTION_LABEL_LENGTH,
+    SUGGESTION_LIMIT,
+    index_posts,
+    row_to_post,
+    top_posts_in_memory,
+)
+from app.search_index import PostSearchIndex
+from app.seed import generate_posts
+from app.states.management_state import MANAGEMENT_PAGE_SIZE, ManagementState
+from app.states.state import DashboardState
+
+"""
+Benchmarks for the state computed vars and data-loading paths.
+
+Each case runs against generated datasets (see app/seed.py) and records
+the best latency over a few repeats, the peak traced memory and the size
+of the JSON the result would add to the websocket state. Results are
+compared against benchmarks/baseline.json; any metric that regresses past
+the tolerance, a baseline entry with no matching case, or a missing
+baseline fails the run with exit code 1.
+
+Usage:
+    python -m benchmarks.run                      # 1k, 100k, 1M posts
+    python -m benchmarks.run --sizes 1000,100000
+    python -m benchmarks.run --update-baseline
+"""
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+class StateStub:
+    def __init__(self, state_cls, **values: Any):
+        self._state_cls = state_cls
+        self.__dict__.update(values)
+
+    def __getattr__(self, name: str) -> Any:
+        computed_var = self._state_cls.computed_vars.get(name)
+        if computed_var is None:
+            raise AttributeError(name)
+        return computed_var._fget(self)
+
+
+class SQLiteRow(dict):
+    __getattr__ = dict.__getitem__
+
+
+def build_dataset(size: int) -> list[Post]:
+    posts = []
+    for post_id, row in enumerate(generate_posts(size), start=1):
+        del row["scheduled_at"]
+        posts.append(
+            {
+                **row,
+                "id": post_id,
+                "media_derivatives": {},
+                "publication_date": row["publication_date"].isoformat(),
+                "created_at": row["created_at"].isoformat(),
+                "updated_at": row["created_at"].isoformat(),
+            }
+        )
+    return posts
+
+
+def build_sqlite(posts: list[Post]) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    connection.execute(
+        """
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY, content TEXT, publication_date DATE,
+            status TEXT, likes INTEGER, comments INTEGER, engagement_rate REAL,
+            media_urls JSON, media_derivatives JSON, created_at TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+    connection.executemany(
+        "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                p["id"],
+                p["content"],
+                p["publication_date"],
+                p["status"],
+                p["likes"],
+                p["comments"],
+                p["engagement_rate"],
+                json.dumps(p["media_urls"]) if p["media_urls"] else None,
+                json.dumps(p["media_derivatives"]),
+                p["created_at"],
+                p["updated_at"],
+            )
+            for p in posts
+        ),
+    )
+    connection.execute("CREATE INDEX posts_publication_date_idx ON posts (publication_date)")
+    connection.execute(
+        "CREATE INDEX posts_status_publication_date_idx ON posts (status, publication_date DESC, id DESC)"
+    )
+    connection.execute(
+        "CREATE INDEX posts_engagement_rate_id_idx ON posts (engagement_rate DESC, id DESC)"
+    )
+    connection.commit()
+
+    def row_factory(cursor, values):
+        row = SQLiteRow(zip((c[0] for c in cursor.description), values))
+        if row.get("media_urls") is not None:
+            row["media_urls"] = json.loads(row["media_urls"])
+        if row.get("media_derivatives") is not None:
+            row["media_derivatives"] = json.loads(row["media_derivatives"])
+        return row
+
+    connection.row_factory = row_factory
+    return connection
+
+
+def fetch_from_sqlite(connection: sqlite3.Connection, where: str = "") -> list[Post]:
+    rows = connection.execute(
+        f"SELECT {POST_COLUMNS} FROM posts {where} ORDER BY publication_date DESC"
+    ).fetchall()
+    return [row_to_post(row) for row in rows]
+
+
+def fetch_dashboard_from_sqlite(
+    connection: sqlite3.Connection, limit: int, cursor: tuple | None = None
+) -> tuple[dict, list[dict]]:
+    stats = connection.execute(
+        """
+        SELECT
+            count(*) AS total_posts,
+            coalesce(sum(likes) FILTER (WHERE status = 'Published'), 0) AS total_likes,
+            coalesce(sum(comments) FILTER (WHERE status = 'Published'), 0) AS total_comments,
+            coalesce(round(avg(engagement_rate) FILTER (WHERE status = 'Published'), 2), 0) AS avg_engagement
+        FROM posts
+        """
+    ).fetchone()
+    where, params = "", [DASHBOARD_PREVIEW_LENGTH]
+    if cursor is not None:
+        where = "WHERE (engagement_rate, id) < (?, ?)"
+        params.extend(cursor)
+    page = connection.execute(
+        f"SELECT id, substr(content, 1, ?) AS content, publication_date, status, engagement_rate FROM posts {where} ORDER BY engagement_rate DESC, id DESC LIMIT ?",
+        (*params, limit),
+    ).fetchall()
+    return stats, page
+
+
+def fetch_management_from_sqlite(
+    connection: sqlite3.Connection, status: str, limit: int
+) -> list[dict]:
+    return connection.execute(
+        "SELECT id, substr(content, 1, ?) AS content, publication_date, status, engagement_rate FROM posts WHERE status = ? ORDER BY publication_date DESC, id DESC LIMIT ?",
+        (MANAGEMENT_PREVIEW_LENGTH, status, limit),
+    ).fetchall()
+
+
+def build_cases(posts: list[Post]) -> dict[str, Callable[[], Any]]:
+    middle_id = posts[len(posts) // 2]["id"] if posts else 0
+    published = [p for p in posts if p["status"] == "Published"]
+    dashboard = StateStub(
+        DashboardState,
+        posts=posts,
+        current_page=2,
+        items_per_page=5,
+        sort_by="engagement_rate",
+        sort_ascending=False,
+        server_paging=False,
+        page_posts=[],
+        total_count=len(posts),
+    )
+    connection = build_sqlite(posts)
+    stats, first_page = fetch_dashboard_from_sqlite(connection, 5)
+    cursor = (
+        (first_page[-1]["engagement_rate"], first_page[-1]["id"]) if first_page else None
+    )
+    _, second_page = fetch_dashboard_from_sqlite(connection, 5, cursor)
+    paged_dashboard = StateStub(
+        DashboardState,
+        posts=[],
+        current_page=2,
+        items_per_page=5,
+        sort_by="engagement_rate",
+        sort_ascending=False,
+        server_paging=True,
+        page_posts=[
+            {**row, "publication_date": str(row["publication_date"])}
+            for row in second_page
+        ],
+        total_count=stats["total_posts"],
+        stats=dict(stats),
+    )
+    management = StateStub(
+        ManagementState,
+        filter_status="Published",
+        search_query="",
+        current_page=1,
+        page_posts=[
+            {**row, "publication_date": str(row["publication_date"])}
+            for row in fetch_management_from_sqlite(
+                connection, "Published", MANAGEMENT_PAGE_SIZE
+            )
+        ],
+    )
+    posts_by_id = index_posts(posts)
+    search_index = PostSearchIndex.from_posts(posts)
+    return {
+        "dashboard.sorted_posts": lambda: dashboard.sorted_posts,
+        "dashboard.paginated_posts": lambda: dashboard.paginated_posts,
+        "dashboard.kpis": lambda: (
+            dashboard.total_posts,
+            dashboard.total_likes,
+            dashboard.total_comments,
+            dashboard.avg_engagement,
+        ),
+        "dashboard.paged.paginated_posts": lambda: paged_dashboard.paginated_posts,
+        "dashboard.paged.kpis": lambda: (
+            paged_dashboard.total_posts,
+            paged_dashboard.total_likes,
+            paged_dashboard.total_comments,
+            paged_dashboard.avg_engagement,
+        ),
+        "management.page_posts": lambda: management.page_posts,
+        "lookup.index_build": lambda: index_posts(posts),
+        "lookup.by_id": lambda: posts_by_id.get(middle_id),
+        "lookup.by_primary_key": lambda: fetch_from_sqlite(
+            connection, f"WHERE id = {middle_id}"
+        ),
+        "analytics.suggest": lambda: search_index.search(
+            "lead #ai", limit=SUGGESTION_LIMIT
+        ),
+        "analytics.top_posts": lambda: top_posts_in_memory(
+            published, "engagement_rate", 3
+        ),
+        "fetch.dashboard": lambda: fetch_dashboard_from_sqlite(connection, 5, cursor),
+        "fetch.management": lambda: fetch_management_from_sqlite(
+            connection, "Published", MANAGEMENT_PAGE_SIZE
+        ),
+        "fetch.analytics": lambda: (
+            connection.execute(
+                "SELECT id, substr(content, 1, ?) AS label FROM posts WHERE status = 'Published' ORDER BY publication_date DESC, id DESC LIMIT ?",
+                (SUGGESTION_LABEL_LENGTH, SUGGESTION_LIMIT),
+            ).fetchall(),
+            fetch_from_sqlite(connection, f"WHERE id = {middle_id}"),
+        ),
+        "search.build_index": lambda: PostSearchIndex.from_posts(posts),
+        "search.query": lambda: search_index.search("lead #ai"),
+    }
+
+
+def measure(case: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = case()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    result = case()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    payload = json.dumps(result, default=str).encode()
+    return {
+        "latency_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "state_bytes": len(payload),
+    }
+
+
+def run(sizes: list[int], repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for size in sizes:
+        print(f"Generating {size:,} posts...")
+        posts = build_dataset(size)
+        for name, case in build_cases(posts).items():
+            key = f"{name}[{size}]"
+            results[key] = measure(case, repeat if size < 1000000 else 1)
+            metrics = results[key]
+            print(
+                f"  {key:<40} {metrics['latency_ms']:>10.3f} ms"
+                f" {metrics['peak_memory_kb']:>12.1f} KiB {metrics['state_bytes']:>12,} B"
+            )
+    return results
+
+
+def case_size(key: str) -> int | None:
+    if not key.endswith("]") or "[" not in key:
+        return None
+    return int(key[key.rindex("[") + 1 : -1])
+
+
+def stale_keys(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]
+) -> list[str]:
+    sizes = {case_size(key) for key in results}
+    return sorted(
+        key
+        for key in baseline
+        if case_size(key) in sizes and key not in results
+    )
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    regressions = [
+        f"{key}: in the baseline but no longer benchmarked"
+        for key in stale_keys(results, baseline)
+    ]
+    for key, metrics in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        for metric in ("latency_ms", "peak_memory_kb", "state_bytes"):
+            limit = expected[metric] * (1 + tolerance)
+            if metric == "latency_ms":
+                limit += 0.5
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{key} {metric}: {metrics[metric]} > {expected[metric]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark state and data paths.")
+    parser.add_argument(
+        "--sizes", default=",".join(str(s) for s in DEFAULT_SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = run(sizes, args.repeat)
+    if args.update_baseline:
+        baseline = (
+            json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        )
+        for key in stale_keys(results, baseline):
+            del baseline[key]
+        baseline.update(results)
+        baseline["_recorded_at"] = datetime.datetime.now().isoformat()
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+    if not BASELINE_PATH.exists():
+        print(f"No baseline at {BASELINE_PATH}; record one with --update-baseline.")
+        sys.exit(1)
+    baseline = json.loads(BASELINE_PATH.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("REGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
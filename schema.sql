@@ -74,3 +74,237 @@ CREATE TABLE pg_stat_statements (
 	minmax_stats_since TIMESTAMP WITH TIME ZONE
 )
 
+
+
+
+ALTER TABLE posts ADD COLUMN search_vector TSVECTOR NOT NULL DEFAULT ''::tsvector
+
+
+
+CREATE FUNCTION posts_search_vector_update() RETURNS trigger AS $$
+BEGIN
+	NEW.search_vector := to_tsvector('simple', NEW.content) || array_to_tsvector(
+		ARRAY(SELECT DISTINCT lower(m[1]) FROM regexp_matches(NEW.content, '(#[[:alnum:]]+)', 'g') AS m)
+	);
+	RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+
+
+
+CREATE TRIGGER posts_search_vector_trigger BEFORE INSERT OR UPDATE OF content ON posts
+	FOR EACH ROW EXECUTE FUNCTION posts_search_vector_update()
+
+
+
+CREATE INDEX posts_search_vector_idx ON posts USING GIN (search_vector)
+
+
+
+ALTER TABLE posts ADD COLUMN media_derivatives JSONB DEFAULT '{}'::jsonb NOT NULL
+
+
+
+CREATE TABLE post_metrics (
+	post_id BIGINT NOT NULL, 
+	recorded_at TIMESTAMP WITH TIME ZONE NOT NULL, 
+	likes INTEGER DEFAULT 0 NOT NULL, 
+	comments INTEGER DEFAULT 0 NOT NULL, 
+	impressions INTEGER DEFAULT 0 NOT NULL, 
+	CONSTRAINT post_metrics_pkey PRIMARY KEY (post_id, recorded_at), 
+	CONSTRAINT post_metrics_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+)
+
+
+
+CREATE INDEX post_metrics_recorded_at_idx ON post_metrics (recorded_at)
+
+
+
+CREATE TABLE post_metrics_daily (
+	post_id BIGINT NOT NULL, 
+	day DATE NOT NULL, 
+	likes BIGINT DEFAULT 0 NOT NULL, 
+	comments BIGINT DEFAULT 0 NOT NULL, 
+	impressions BIGINT DEFAULT 0 NOT NULL, 
+	CONSTRAINT post_metrics_daily_pkey PRIMARY KEY (post_id, day), 
+	CONSTRAINT post_metrics_daily_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+)
+
+
+
+CREATE TABLE post_metrics_weekly (
+	post_id BIGINT NOT NULL, 
+	week DATE NOT NULL, 
+	likes BIGINT DEFAULT 0 NOT NULL, 
+	comments BIGINT DEFAULT 0 NOT NULL, 
+	impressions BIGINT DEFAULT 0 NOT NULL, 
+	CONSTRAINT post_metrics_weekly_pkey PRIMARY KEY (post_id, week), 
+	CONSTRAINT post_metrics_weekly_post_id_fkey FOREIGN KEY(post_id) REFERENCES posts (id) ON DELETE CASCADE
+)
+
+
+
+CREATE INDEX posts_published_engagement_rate_idx ON posts (engagement_rate DESC, id DESC) WHERE status = 'Published'
+
+
+
+CREATE INDEX posts_published_likes_idx ON posts (likes DESC, id DESC) WHERE status = 'Published'
+
+
+
+CREATE INDEX posts_published_comments_idx ON posts (comments DESC, id DESC) WHERE status = 'Published'
+
+
+
+CREATE TABLE query_stats_snapshots (
+	id SERIAL NOT NULL, 
+	label TEXT NOT NULL, 
+	taken_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	stats JSONB NOT NULL, 
+	CONSTRAINT query_stats_snapshots_pkey PRIMARY KEY (id)
+)
+
+
+
+CREATE INDEX posts_publication_date_id_idx ON posts (publication_date DESC, id DESC)
+
+
+
+CREATE INDEX posts_engagement_rate_id_idx ON posts (engagement_rate DESC, id DESC)
+
+
+
+CREATE INDEX posts_status_publication_date_idx ON posts (status, publication_date DESC, id DESC)
+
+
+
+ALTER TABLE posts ADD COLUMN scheduled_at TIMESTAMP WITH TIME ZONE
+
+
+
+CREATE INDEX posts_scheduled_at_idx ON posts (scheduled_at, id) WHERE status = 'Scheduled'
+
+
+
+CREATE TABLE schema_migrations (
+	version TEXT NOT NULL, 
+	checksum TEXT NOT NULL, 
+	applied_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	CONSTRAINT schema_migrations_pkey PRIMARY KEY (version)
+)
+
+
+
+ALTER TYPE post_status ADD VALUE 'Archived'
+
+
+
+CREATE FUNCTION posts_notify_changes() RETURNS trigger AS $$
+DECLARE
+	changed_ids BIGINT[];
+	chunk_start INTEGER := 1;
+BEGIN
+	IF TG_OP = 'DELETE' THEN
+		SELECT array_agg(id) INTO changed_ids FROM old_rows;
+	ELSE
+		SELECT array_agg(id) INTO changed_ids FROM new_rows;
+	END IF;
+	WHILE changed_ids IS NOT NULL AND chunk_start <= array_length(changed_ids, 1) LOOP
+		PERFORM pg_notify(
+			'posts_changes',
+			json_build_object('op', lower(TG_OP), 'ids', changed_ids[chunk_start:chunk_start + 499])::text
+		);
+		chunk_start := chunk_start + 500;
+	END LOOP;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+
+
+
+CREATE TRIGGER posts_notify_insert AFTER INSERT ON posts
+	REFERENCING NEW TABLE AS new_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes()
+
+
+
+CREATE TRIGGER posts_notify_update AFTER UPDATE ON posts
+	REFERENCING NEW TABLE AS new_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes()
+
+
+
+CREATE TRIGGER posts_notify_delete AFTER DELETE ON posts
+	REFERENCING OLD TABLE AS old_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_notify_changes()
+
+
+
+ALTER TABLE posts ADD COLUMN updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL
+
+
+
+CREATE FUNCTION posts_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+	NEW.updated_at := now();
+	RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+
+
+
+CREATE TRIGGER posts_touch_updated_at BEFORE UPDATE ON posts
+	FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION posts_touch_updated_at()
+
+
+
+CREATE INDEX posts_updated_at_idx ON posts (updated_at)
+
+
+
+CREATE TABLE post_tombstones (
+	post_id BIGINT NOT NULL, 
+	deleted_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	CONSTRAINT post_tombstones_pkey PRIMARY KEY (post_id)
+)
+
+
+
+CREATE INDEX post_tombstones_deleted_at_idx ON post_tombstones (deleted_at)
+
+
+
+CREATE FUNCTION posts_record_tombstones() RETURNS trigger AS $$
+BEGIN
+	INSERT INTO post_tombstones (post_id)
+	SELECT id FROM old_rows
+	ON CONFLICT (post_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+
+
+
+CREATE TRIGGER posts_record_tombstones AFTER DELETE ON posts
+	REFERENCING OLD TABLE AS old_rows
+	FOR EACH STATEMENT EXECUTE FUNCTION posts_record_tombstones()
+
+
+
+CREATE FUNCTION posts_record_metric_sample() RETURNS trigger AS $$
+BEGIN
+	INSERT INTO post_metrics (post_id, recorded_at, likes, comments)
+	VALUES (NEW.id, clock_timestamp(), NEW.likes - OLD.likes, NEW.comments - OLD.comments)
+	ON CONFLICT (post_id, recorded_at) DO UPDATE SET
+		likes = post_metrics.likes + EXCLUDED.likes,
+		comments = post_metrics.comments + EXCLUDED.comments;
+	RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+
+
+
+CREATE TRIGGER posts_record_metric_sample AFTER UPDATE OF likes, comments ON posts
+	FOR EACH ROW WHEN (OLD.likes <> NEW.likes OR OLD.comments <> NEW.comments)
+	EXECUTE FUNCTION posts_record_metric_sample()